@@ -4,12 +4,61 @@ from PIL import Image
 import sys
 import os
 import streamlit as st
+import streamlit.components.v1 as components
 import numpy as np
 import io
+import glob
+import math
+import time
+import html
+import hashlib
+import zipfile
+import threading
+import functools
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Add the current directory to Python path for local imports
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+import glyph_ramp
+
+try:
+    from result_cache import cached
+except ImportError:  # Running outside the hub, without the shared cache
+    def cached(name=None, ttl=None, max_memory_mb=None, max_disk_mb=None, cache_if=None):
+        return lambda func: func
 
 # ASCII characters used for the conversion (from darkest to lightest)
 ASCII_CHARS = ["@", "#", "S", "%", "?", "*", "+", ";", ":", ",", "."]
 
+# File extensions picked up when converting a directory
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".tif", ".tiff", ".webp", ".ppm", ".pgm", ".pbm")
+
+# Source images above this many pixels are converted strip by strip
+TILED_THRESHOLD_PIXELS = 16_000_000
+
+# Source pixels decoded at once by the strip-by-strip conversion, where the format allows it
+TILED_STRIP_PIXELS = 1_000_000
+
+# Byte value of the ASCII character for every grayscale level 0-255
+ASCII_LUT = np.frombuffer("".join(ASCII_CHARS).encode("ascii"), dtype=np.uint8)[
+    np.arange(256) * (len(ASCII_CHARS) - 1) // 255
+]
+
+@functools.lru_cache(maxsize=None)
+def font_lut(size=16):
+    """Lookup table for a ramp of `size` glyphs measured from a monospace font (cached on disk)."""
+    return glyph_ramp.ramp_lut(glyph_ramp.load_ramp(size))
+
+@functools.lru_cache(maxsize=None)
+def edge_lut():
+    """Precomputed gradient-direction lookup table for edge-aware conversion."""
+    return glyph_ramp.gradient_lut()
+
 def resize_image(image, new_width=100):
     """Resize image to fit the specified width while maintaining aspect ratio."""
     width, height = image.size
@@ -22,19 +71,172 @@ def grayscale(image):
     """Convert image to grayscale."""
     return image.convert("L")
 
-def pixels_to_ascii(image):
-    """Convert pixels to ASCII characters based on brightness."""
-    pixels = np.array(image)
-    ascii_str = ""
-    for row in pixels:
-        for pixel in row:
-            index = pixel * (len(ASCII_CHARS) - 1) // 255
-            ascii_str += ASCII_CHARS[index]
-        ascii_str += "\n"
-    return ascii_str
-
-def image_to_ascii(image_path, width=100, save_file=None):
-    """Convert image to ASCII art."""
+@cached()
+def pixels_to_ascii(image, lut=None, edges=False):
+    """
+    Convert pixels to ASCII characters based on brightness.
+    lut overrides the ASCII_CHARS lookup table (see font_lut); edges swaps in
+    directional glyphs along strong edges.
+    """
+    pixels = np.asarray(image, dtype=np.uint8)
+    # Map every pixel through the lookup table and end each row with a newline
+    chars = np.empty((pixels.shape[0], pixels.shape[1] + 1), dtype=np.uint8)
+    chars[:, :-1] = (ASCII_LUT if lut is None else lut)[pixels]
+    if edges:
+        glyph_ramp.apply_edges(pixels, chars[:, :-1], edge_lut())
+    chars[:, -1] = ord("\n")
+    return chars.tobytes().decode("ascii")
+
+def iter_ascii_rows(image, lut=None):
+    """Yield the ASCII art one row at a time, each row ending with a newline."""
+    lut = ASCII_LUT if lut is None else lut
+    pixels = np.asarray(image, dtype=np.uint8)
+    row = np.empty(pixels.shape[1] + 1, dtype=np.uint8)
+    row[-1] = ord("\n")
+    for pixel_row in pixels:
+        np.take(lut, pixel_row, out=row[:-1])
+        yield row.tobytes().decode("ascii")
+
+def write_ascii(image, file):
+    """Stream the ASCII art to an open text file, holding one row at a time."""
+    for row in iter_ascii_rows(image):
+        file.write(row)
+
+@cached()
+def colour_ascii_html(image, width=100, levels=4, lut=None):
+    """
+    Render colour ASCII art as HTML.
+    Each cell's RGB colour is quantized to a palette of levels**3 colours and
+    runs of same-colour characters on a row are merged into a single span.
+    Returns (css, body): the palette classes and the span markup.
+    """
+    rgb = np.asarray(resize_image(image.convert("RGB"), width), dtype=np.uint16)
+    height = rgb.shape[0]
+    chars = (ASCII_LUT if lut is None else lut)[np.asarray(grayscale(Image.fromarray(rgb.astype(np.uint8))))]
+
+    # Palette index per cell
+    quantized = (rgb * levels) >> 8
+    colours = (quantized[..., 0] * levels + quantized[..., 1]) * levels + quantized[..., 2]
+
+    # A run starts at every row start and wherever the colour changes
+    starts = np.ones(colours.shape, dtype=bool)
+    starts[:, 1:] = colours[:, 1:] != colours[:, :-1]
+    run_starts = np.flatnonzero(starts)
+    run_ends = np.append(run_starts[1:], colours.size)
+    run_colours = colours.ravel()[run_starts]
+    text = chars.tobytes().decode("ascii")
+
+    # Close each row after its last run
+    row_ends = set(range(width, colours.size + 1, width))
+    parts = []
+    for start, end, colour in zip(run_starts.tolist(), run_ends.tolist(), run_colours.tolist()):
+        parts.append(f'<span class="c{colour}">{html.escape(text[start:end])}</span>')
+        if end in row_ends:
+            parts.append("\n")
+
+    step = 255 / max(levels - 1, 1)
+    css = "".join(
+        f".c{index}{{color:#{round(r * step):02x}{round(g * step):02x}{round(b * step):02x}}}"
+        for index in np.unique(run_colours).tolist()
+        for r, g, b in [(index // (levels * levels), index // levels % levels, index % levels)]
+    )
+    return css, "".join(parts) if height else ""
+
+def _raw_tiles(image):
+    """
+    The tiles of a not yet decoded image as (x0, y0, x1, y1, offset, rawmode,
+    stride, orientation) tuples, if every tile is stored uncompressed (BMP, PPM,
+    uncompressed TIFF) so any band of rows can be read on its own. None otherwise.
+    """
+    if image.fp is None or not image.tile or image.palette is not None:
+        return None
+    tiles = []
+    for decoder_name, (x0, y0, x1, y1), offset, args in image.tile:
+        if decoder_name != "raw":
+            return None
+        args = (args,) if isinstance(args, str) else tuple(args)
+        rawmode = args[0]
+        stride = args[1] if len(args) > 1 else 0
+        orientation = args[2] if len(args) > 2 else 1
+        if not stride:
+            try:
+                stride = len(Image.new(image.mode, (x1 - x0, 1)).tobytes("raw", rawmode))
+            except (ValueError, OSError):
+                return None
+        tiles.append((x0, y0, x1, y1, offset, rawmode, stride, orientation))
+    return tiles
+
+def _read_rows(image, tiles, top, bottom):
+    """Decode source rows top to bottom, reading only their bytes from the file"""
+    band = None
+    for x0, y0, x1, y1, offset, rawmode, stride, orientation in tiles:
+        start, end = max(y0, top), min(y1, bottom)
+        if start >= end:
+            continue
+        # Bottom-up tiles (BMP) store their last row first
+        skipped = start - y0 if orientation > 0 else y1 - end
+        image.fp.seek(offset + skipped * stride)
+        data = image.fp.read((end - start) * stride)
+        piece = Image.frombuffer(image.mode, (x1 - x0, end - start), data, "raw", rawmode, stride, orientation)
+        if (x0, start, x1, end) == (0, top, image.width, bottom):
+            return piece
+        if band is None:
+            band = Image.new(image.mode, (image.width, bottom - top))
+        band.paste(piece, (x0, start - top))
+    return band
+
+def iter_ascii_rows_tiled(image, width=100, strip_rows=16, lut=None):
+    """
+    Yield ASCII rows for a very large image, decoding as little of it at once
+    as its format allows. Uncompressed images (BMP, PPM, uncompressed TIFF)
+    are read from the file one band of rows at a time, each band covering at
+    most strip_rows output rows and about TILED_STRIP_PIXELS source pixels (at
+    least one output row's worth). Compressed formats cannot be decoded in
+    parts, so they are decoded whole and resized in one go: JPEGs at reduced
+    scale via draft mode (down to 1/8), others such as PNG at full size.
+    """
+    lut = ASCII_LUT if lut is None else lut
+    src_width, src_height = image.size
+    height = max(int(src_height / src_width * width), 1)
+
+    tiles = _raw_tiles(image)
+    if tiles is None:
+        # Keep at least two source pixels per output cell for a smooth downsample
+        image.draft("L", (width * 2, height * 2))
+        small = image.resize((width, height), reducing_gap=2.0)
+        if small.mode != "L":
+            small = grayscale(small)
+        yield from iter_ascii_rows(small, lut)
+        return
+
+    scale = src_height / height
+    strip_rows = max(1, min(strip_rows, int(TILED_STRIP_PIXELS / (scale * src_width))))
+    row = np.empty(width + 1, dtype=np.uint8)
+    row[-1] = ord("\n")
+    for top in range(0, height, strip_rows):
+        rows = min(strip_rows, height - top)
+        box_top, box_bottom = top * scale, min((top + rows) * scale, src_height)
+        band_top, band_bottom = int(box_top), min(math.ceil(box_bottom), src_height)
+        band = _read_rows(image, tiles, band_top, band_bottom)
+        strip = band.resize(
+            (width, rows), box=(0, box_top - band_top, src_width, box_bottom - band_top), reducing_gap=2.0
+        )
+        if strip.mode != "L":
+            strip = grayscale(strip)
+        for pixel_row in np.asarray(strip):
+            np.take(lut, pixel_row, out=row[:-1])
+            yield row.tobytes().decode("ascii")
+
+def image_to_ascii(image_path, width=100, save_file=None, tiled=None, lut=None, edges=False):
+    """
+    Convert image to ASCII art.
+    Returns the art as a string, or, when save_file (a path or an open text
+    file) is given, streams it there row by row and returns save_file.
+    Images above TILED_THRESHOLD_PIXELS (or any image, with tiled=True) go
+    through iter_ascii_rows_tiled, which bounds memory use for uncompressed
+    formats. lut and edges are passed
+    on to pixels_to_ascii; edges only apply to in-memory conversions.
+    """
     try:
         # Open image
         image = Image.open(image_path)
@@ -42,61 +244,361 @@ def image_to_ascii(image_path, width=100, save_file=None):
         print(f"Error opening image: {e}")
         return
 
+    if tiled is None:
+        tiled = image.width * image.height > TILED_THRESHOLD_PIXELS
+
     # Convert image to ASCII
-    image = resize_image(image, width)
-    image = grayscale(image)
+    if tiled:
+        rows = iter_ascii_rows_tiled(image, width, lut=lut)
+    else:
+        image = resize_image(image, width)
+        image = grayscale(image)
+        if not save_file:
+            return pixels_to_ascii(image, lut, edges)
+        rows = iter_ascii_rows(image, lut)
     
-    ascii_str = pixels_to_ascii(image)
-    
-    # Split the string based on width to create image rows
-    img_width = image.width
-    ascii_str_len = len(ascii_str)
-    ascii_img = ""
-    
-    # Format the ASCII string into lines
-    for i in range(0, ascii_str_len, img_width):
-        ascii_img += ascii_str[i:i + img_width] + "\n"
-    
-    # Print or save the result
-    if save_file:
+    if not save_file:
         try:
+            return "".join(rows)
+        except Exception as e:
+            print(f"Error converting image: {e}")
+            return
+    
+    # Save the result without building the whole string
+    try:
+        if hasattr(save_file, "write"):
+            save_file.writelines(rows)
+        else:
             with open(save_file, 'w') as f:
-                f.write(ascii_img)
+                f.writelines(rows)
             print(f"ASCII art saved to {save_file}")
-        except Exception as e:
-            print(f"Error saving file: {e}")
+    except Exception as e:
+        print(f"Error saving file: {e}")
+        return
     
-    return ascii_img
+    return save_file
+
+# Per-thread character buffers reused between animation frames
+_frame_buffers = threading.local()
+
+def _frame_to_ascii(gray_frame, size):
+    """Worker: resize one grayscale frame and map it into the thread's reused character buffer."""
+    pixels = np.asarray(gray_frame.resize(size))
+    chars = getattr(_frame_buffers, "chars", None)
+    if chars is None or chars.shape != (size[1], size[0] + 1):
+        chars = np.empty((size[1], size[0] + 1), dtype=np.uint8)
+        chars[:, -1] = ord("\n")
+        _frame_buffers.chars = chars
+    np.take(ASCII_LUT, pixels, out=chars[:, :-1], mode="clip")
+    return chars.tobytes().decode("ascii")
+
+def iter_ascii_frames(image, width=100, workers=None, prefetch=None):
+    """
+    Yield (ascii frame, duration in ms) for every frame of a multi-frame image.
+    Frames are decoded lazily, one at a time, and converted on a thread pool
+    with at most `prefetch` frames in flight, so memory stays bounded no
+    matter how many frames the image has.
+    """
+    workers = workers or os.cpu_count() or 1
+    prefetch = prefetch or workers * 2
+    aspect_ratio = image.height / image.width
+    size = (width, max(int(aspect_ratio * width), 1))
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for index in range(getattr(image, "n_frames", 1)):
+            image.seek(index)
+            # Seeking reuses the decoder's frame, so hand the worker its own grayscale copy
+            gray_frame = grayscale(image)
+            duration = image.info.get("duration") or 100
+            pending.append((executor.submit(_frame_to_ascii, gray_frame, size), duration))
+            if len(pending) >= prefetch:
+                future, duration = pending.popleft()
+                yield future.result(), duration
+        while pending:
+            future, duration = pending.popleft()
+            yield future.result(), duration
+
+def write_html_animation(frames, file, font_size=10):
+    """Stream (ascii frame, duration) pairs into a self-playing HTML page."""
+    file.write(f"""<html>
+<head>
+<style>
+    body {{ background-color: #0e1117; margin: 0; padding: 20px; }}
+    .ascii-frame {{
+        display: none;
+        font-family: monospace;
+        font-size: {font_size}px;
+        white-space: pre;
+        line-height: 1;
+        color: #ffffff;
+        margin: 0;
+    }}
+</style>
+</head>
+<body>
+""")
+    for ascii_str, duration in frames:
+        file.write(f'<pre class="ascii-frame" data-duration="{int(duration)}">{html.escape(ascii_str)}</pre>\n')
+    file.write("""<script>
+    const frames = document.querySelectorAll(".ascii-frame");
+    let current = 0;
+    function show() {
+        frames.forEach((frame, i) => frame.style.display = i === current ? "block" : "none");
+        const delay = parseInt(frames[current].dataset.duration) || 100;
+        current = (current + 1) % frames.length;
+        if (frames.length > 1) setTimeout(show, delay);
+    }
+    if (frames.length) show();
+</script>
+</body>
+</html>
+""")
+
+def play_in_terminal(frames):
+    """Play (ascii frame, duration) pairs in the terminal, redrawing in place."""
+    sys.stdout.write("\x1b[2J")
+    for ascii_str, duration in frames:
+        sys.stdout.write("\x1b[H" + ascii_str)
+        sys.stdout.flush()
+        time.sleep(duration / 1000)
+
+def find_images(inputs):
+    """
+    Expand files, directories and glob patterns into a sorted list of image paths.
+    Files named explicitly are kept whatever their extension; Pillow decides if they are images.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isfile(item):
+            paths.add(os.path.normpath(item))
+            continue
+        if os.path.isdir(item):
+            candidates = [os.path.join(item, name) for name in os.listdir(item)]
+        else:
+            candidates = glob.glob(item, recursive=True) or [item]
+        paths.update(
+            os.path.normpath(path) for path in candidates
+            if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS)
+        )
+    return sorted(paths)
+
+def _convert_for_batch(path, width, to_archive):
+    """Process pool worker: convert one image, writing it next to the input or returning the text."""
+    try:
+        with Image.open(path) as image:
+            image = grayscale(resize_image(image, width))
+        if to_archive:
+            return path, "".join(iter_ascii_rows(image)), None
+        # Keep the source extension so photo.png and photo.jpg do not share an output
+        with open(path + ".txt", "w") as f:
+            write_ascii(image, f)
+        return path, None, None
+    except Exception as e:
+        return path, None, str(e)
+
+def convert_batch(paths, width=100, archive=None, workers=None):
+    """
+    Convert images across a process pool sized to the available cores.
+    Outputs are written next to the inputs (photo.png -> photo.png.txt), or
+    into a zip archive under their path relative to the inputs' common folder.
+    Returns (converted, failures, seconds).
+    """
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 4))
+    converted = 0
+    failures = []
+    start = time.perf_counter()
+
+    zip_file = zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) if archive else None
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths]) if paths else ""
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _convert_for_batch, paths, [width] * len(paths), [bool(archive)] * len(paths),
+                chunksize=chunksize
+            )
+            for path, ascii_str, error in results:
+                if error:
+                    failures.append((path, error))
+                    continue
+                if zip_file:
+                    entry = os.path.relpath(os.path.abspath(path), root).replace(os.sep, "/")
+                    zip_file.writestr(entry + ".txt", ascii_str)
+                converted += 1
+    finally:
+        if zip_file:
+            zip_file.close()
+
+    return converted, failures, time.perf_counter() - start
+
+def cli(argv=None):
+    """Command line entry point: convert one image, or a batch of them."""
+    parser = argparse.ArgumentParser(description="Convert images into ASCII art")
+    parser.add_argument("inputs", nargs="+", help="Image files, directories or glob patterns")
+    parser.add_argument("--width", type=int, default=100, help="Output width in characters")
+    parser.add_argument("--save", help="Save a single image's ASCII art to this file")
+    parser.add_argument("--batch", action="store_true", help="Convert every matching image with a process pool")
+    parser.add_argument("--archive", help="Write batch outputs into this zip file instead of next to the inputs")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: all cores)")
+    parser.add_argument("--animate", action="store_true",
+                        help="Play an animated image in the terminal, or write it as HTML with --save")
+    parser.add_argument("--loop", action="store_true", help="Keep replaying the terminal animation")
+    parser.add_argument("--tiled", action="store_true",
+                        help="Convert strip by strip, with bounded memory for BMP, PPM and uncompressed TIFF (automatic for very large images)")
+    parser.add_argument("--charset", choices=["classic", "font"], default="classic",
+                        help="Classic ASCII_CHARS ramp, or a ramp measured from a monospace font")
+    parser.add_argument("--edges", action="store_true", help="Draw strong edges with directional characters")
+    parser.add_argument("--no-pixel-limit", action="store_true",
+                        help="Allow gigapixel images that Pillow would reject as decompression bombs")
+    args = parser.parse_args(argv)
+
+    if args.no_pixel_limit:
+        Image.MAX_IMAGE_PIXELS = None
+
+    paths = find_images(args.inputs)
+    if args.animate:
+        if len(paths) != 1:
+            print("--animate takes exactly one image")
+            return 1
+        try:
+            with Image.open(paths[0]) as image:
+                if args.save:
+                    with open(args.save, "w") as f:
+                        write_html_animation(iter_ascii_frames(image, args.width, args.workers), f)
+                    print(f"ASCII animation saved to {args.save}")
+                    return 0
+                while True:
+                    play_in_terminal(iter_ascii_frames(image, args.width, args.workers))
+                    if not args.loop:
+                        return 0
+        except KeyboardInterrupt:
+            return 0
+        except Exception as e:
+            print(f"Error converting animation: {e}")
+            return 1
+
+    if not args.batch and len(paths) == 1 and len(args.inputs) == 1 and not os.path.isdir(args.inputs[0]):
+        lut = font_lut() if args.charset == "font" else None
+        ascii_str = image_to_ascii(paths[0], args.width, args.save, tiled=args.tiled or None, lut=lut, edges=args.edges)
+        if ascii_str is None:
+            return 1
+        if not args.save:
+            print(ascii_str, end="")
+        return 0
+
+    if not paths:
+        print("No images found")
+        return 1
+
+    converted, failures, seconds = convert_batch(paths, args.width, args.archive, args.workers)
+    for path, error in failures:
+        print(f"Error converting {path}: {error}")
+    rate = converted / seconds if seconds else 0.0
+    print(f"Converted {converted}/{len(paths)} images in {seconds:.2f}s ({rate:.1f} images/s)")
+    if args.archive:
+        print(f"ASCII art saved to {args.archive}")
+    return 0 if not failures else 1
+
+def build_html_page(art_css, art_html, font_size):
+    """Standalone HTML page for the HTML download."""
+    return f"""
+    <html>
+    <head>
+        <style>
+            body {{
+                background-color: #0e1117;
+                margin: 0;
+                padding: 20px;
+            }}
+            .ascii-art {{
+                font-family: monospace;
+                font-size: {font_size}px;
+                white-space: pre;
+                line-height: 1;
+                color: #ffffff;
+                background-color: #0e1117;
+                padding: 20px;
+                border-radius: 5px;
+                border: 1px solid #333;
+            }}
+            {art_css}
+        </style>
+    </head>
+    <body>
+        <div class="ascii-art">{art_html}</div>
+    </body>
+    </html>
+    """
+
+def _upload_hash(uploaded_file):
+    """Content hash of an upload, computed once per uploaded file."""
+    file_id = getattr(uploaded_file, "file_id", None)
+    cached_upload = st.session_state.get("ascii_upload")
+    if file_id and cached_upload and cached_upload[0] == file_id:
+        return cached_upload[1]
+    upload_hash = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    st.session_state.ascii_upload = (file_id, upload_hash)
+    return upload_hash
+
+@st.cache_resource(max_entries=8)
+def _decoded_upload(upload_hash, _data):
+    """
+    Stage 1: decode an upload once; shared read-only across reruns and sessions.
+    Returns the image and its frame count, counted before decoding because it seeks the image.
+    """
+    image = Image.open(io.BytesIO(_data))
+    n_frames = getattr(image, "n_frames", 1)
+    image.load()
+    return image, n_frames
+
+@st.cache_data(max_entries=32)
+def _grayscale_stage(upload_hash, width, _data):
+    """Stage 2: resized grayscale pixels for one output width."""
+    return np.asarray(grayscale(resize_image(_decoded_upload(upload_hash, _data)[0], width)))
+
+@st.cache_data(max_entries=64)
+def _ascii_stage(upload_hash, width, charset, edges, colour_mode, _data):
+    """Stage 3: ASCII text plus the markup (and palette CSS in colour mode) shown on the page."""
+    lut = font_lut() if charset == "Font Density" else None
+    ascii_str = pixels_to_ascii(_grayscale_stage(upload_hash, width, _data), lut, edges)
+    if colour_mode:
+        art_css, art_html = colour_ascii_html(_decoded_upload(upload_hash, _data)[0], width, lut=lut)
+    else:
+        # Escape HTML special characters in ASCII art
+        art_css, art_html = "", html.escape(ascii_str, quote=False)
+    return ascii_str, art_css, art_html
 
 def main():
     st.title("ASCII Art Generator")
     st.write("Convert your images into ASCII art!")
 
     # File uploader
-    uploaded_file = st.file_uploader("Choose an image file", type=["jpg", "jpeg", "png", "bmp"])
+    uploaded_file = st.file_uploader("Choose an image file", type=["jpg", "jpeg", "png", "bmp", "gif", "webp"])
     
     if uploaded_file is not None:
-        # Display original image
-        image = Image.open(uploaded_file)
-        st.image(image, caption="Original Image", use_container_width=True)
+        # Display original image (raw bytes, so Streamlit does not re-encode it on every rerun)
+        data = uploaded_file.getvalue()
+        upload_hash = _upload_hash(uploaded_file)
+        image, n_frames = _decoded_upload(upload_hash, data)
+        st.image(data, caption="Original Image", use_container_width=True)
         
         # Settings
         st.sidebar.header("Settings")
         width = st.sidebar.slider("Output Width", 20, 200, 100, 10)
         font_size = st.sidebar.slider("ASCII Art Size", 8, 24, 14, 2)
+        colour_mode = st.sidebar.checkbox("Colour Output", value=False)
+        charset = st.sidebar.selectbox("Character Set", ["Classic", "Font Density"])
+        edges = st.sidebar.checkbox("Edge-Aware Characters", value=False)
         
-        # Convert to ASCII
-        new_image = resize_image(image, width)
-        new_image = grayscale(new_image)
-        ascii_str = pixels_to_ascii(new_image)
-        
-        # Escape HTML special characters in ASCII art
-        escaped_ascii = ascii_str.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        # Convert to ASCII; each stage is memoized, so font size changes only re-render the HTML
+        ascii_str, art_css, art_html = _ascii_stage(upload_hash, width, charset, edges, colour_mode, data)
         
         # Create styled ASCII art display
         st.markdown("### ASCII Art Output")
         st.markdown(
             f"""
+            <style>{art_css}</style>
             <div style="
                 font-family: monospace;
                 font-size: {font_size}px;
@@ -108,7 +610,7 @@ def main():
                 border-radius: 5px;
                 border: 1px solid #333;
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            ">{escaped_ascii}</div>
+            ">{art_html}</div>
             """,
             unsafe_allow_html=True
         )
@@ -119,51 +621,50 @@ def main():
         
         with col1:
             # Download as text
-            ascii_bytes = ascii_str.encode()
-            bio = io.BytesIO(ascii_bytes)
             st.download_button(
                 label="Download as Text",
-                data=bio,
+                data=ascii_str,
                 file_name="ascii_art.txt",
                 mime="text/plain"
             )
         
         with col2:
-            # Download as HTML (for preserving formatting)
-            html_content = f"""
-            <html>
-            <head>
-                <style>
-                    body {{
-                        background-color: #0e1117;
-                        margin: 0;
-                        padding: 20px;
-                    }}
-                    .ascii-art {{
-                        font-family: monospace;
-                        font-size: {font_size}px;
-                        white-space: pre;
-                        line-height: 1;
-                        color: #ffffff;
-                        background-color: #0e1117;
-                        padding: 20px;
-                        border-radius: 5px;
-                        border: 1px solid #333;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="ascii-art">{escaped_ascii}</div>
-            </body>
-            </html>
-            """
-            bio_html = io.BytesIO(html_content.encode())
-            st.download_button(
-                label="Download as HTML",
-                data=bio_html,
-                file_name="ascii_art.html",
-                mime="text/html"
-            )
+            # The HTML page is only built once it is asked for
+            html_key = (upload_hash, width, charset, edges, colour_mode, font_size)
+            if st.session_state.get("ascii_html_ready") == html_key:
+                st.download_button(
+                    label="Download as HTML",
+                    data=build_html_page(art_css, art_html, font_size),
+                    file_name="ascii_art.html",
+                    mime="text/html"
+                )
+            elif st.button("Prepare HTML Download"):
+                st.session_state.ascii_html_ready = html_key
+                st.rerun()
+        
+        # Animated images can also be rendered frame by frame
+        if n_frames > 1:
+            st.markdown("### ASCII Animation")
+            st.write(f"This image has {n_frames} frames.")
+            if st.button("Render ASCII Animation"):
+                with st.spinner("Converting frames..."):
+                    html_buffer = io.StringIO()
+                    # Seeking mutates the image, so use a private copy rather than the shared one
+                    with Image.open(io.BytesIO(data)) as frames:
+                        write_html_animation(iter_ascii_frames(frames, width), html_buffer, font_size)
+                    animation_html = html_buffer.getvalue()
+                
+                rows = max(int(image.height / image.width * width), 1)
+                components.html(animation_html, height=rows * font_size + 60, scrolling=True)
+                st.download_button(
+                    label="Download Animation (HTML)",
+                    data=animation_html,
+                    file_name="ascii_animation.html",
+                    mime="text/html"
+                )
 
 if __name__ == "__main__":
+    # `streamlit run ascii_art.py` starts the app; `python ascii_art.py <images>` runs the CLI
+    if len(sys.argv) > 1:
+        sys.exit(cli())
     main() 
\ No newline at end of file
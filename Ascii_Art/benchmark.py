@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ASCII art pipeline stage by stage.
+
+Synthetic images are generated in several resolutions, modes and formats,
+then each stage (open + decode, resize_image, grayscale, pixels_to_ascii and
+row formatting) is timed for output widths from 20 to 1000 columns. Results
+are written as JSON so runs from different commits can be compared:
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+"""
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+import numpy as np
+from PIL import Image
+
+import ascii_art
+
+RESOLUTIONS = [(320, 240), (1920, 1080), (4000, 3000)]
+MODES = ["RGB", "RGBA", "P", "L"]
+FORMATS = ["JPEG", "PNG", "BMP"]
+WIDTHS = [20, 50, 100, 200, 500, 1000]
+
+# Formats that cannot store a mode are skipped
+UNSUPPORTED = {("JPEG", "RGBA"), ("JPEG", "P")}
+
+# Bypass the shared result cache so every repeat does the real work
+pixels_to_ascii = getattr(ascii_art.pixels_to_ascii, "__wrapped__", ascii_art.pixels_to_ascii)
+
+def synthetic_image(size, mode, seed=0):
+    """Gradient plus noise, so both the encoders and the character mapping see varied data."""
+    width, height = size
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    base = (x * 255 // max(width - 1, 1) + y * 255 // max(height - 1, 1)) // 2
+    rgb = np.stack([base, 255 - base, (x ^ y) & 0xFF], axis=-1)
+    rgb = np.clip(rgb + rng.integers(-20, 21, rgb.shape), 0, 255).astype(np.uint8)
+    image = Image.fromarray(rgb, "RGB")
+    if mode == "P":
+        return image.quantize(colors=64)
+    return image.convert(mode)
+
+def encode(image, image_format):
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def open_and_decode(data):
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+def format_rows(image):
+    return "".join(ascii_art.iter_ascii_rows(image))
+
+def run_case(data, width, repeats):
+    """Median milliseconds per stage over `repeats` runs."""
+    samples = {stage: [] for stage in ("open", "resize", "grayscale", "pixels_to_ascii", "format", "total")}
+    for _ in range(repeats):
+        image, t_open = time_call(open_and_decode, data)
+        resized, t_resize = time_call(ascii_art.resize_image, image, width)
+        gray, t_gray = time_call(ascii_art.grayscale, resized)
+        _, t_ascii = time_call(pixels_to_ascii, gray)
+        _, t_format = time_call(format_rows, gray)
+        for stage, value in zip(samples, (t_open, t_resize, t_gray, t_ascii, t_format)):
+            samples[stage].append(value)
+        samples["total"].append(t_open + t_resize + t_gray + t_ascii)
+    return {stage: round(statistics.median(values), 3) for stage, values in samples.items()}
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(resolutions, modes, formats, widths, repeats):
+    results = []
+    for size in resolutions:
+        for mode in modes:
+            image = synthetic_image(size, mode)
+            for image_format in formats:
+                if (image_format, mode) in UNSUPPORTED:
+                    continue
+                data = encode(image, image_format)
+                for width in widths:
+                    timings = run_case(data, width, repeats)
+                    results.append({
+                        "resolution": f"{size[0]}x{size[1]}",
+                        "mode": mode,
+                        "format": image_format,
+                        "width": width,
+                        "bytes": len(data),
+                        **{f"{stage}_ms": value for stage, value in timings.items()}
+                    })
+                    print(
+                        f"{size[0]:>5}x{size[1]:<5} {mode:<4} {image_format:<4} width={width:<5} "
+                        f"total={timings['total']:8.2f} ms  ascii={timings['pixels_to_ascii']:7.3f} ms",
+                        file=sys.stderr
+                    )
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pillow": Image.__version__,
+        "repeats": repeats,
+        "results": results
+    }
+
+def case_key(row):
+    return (row["resolution"], row["mode"], row["format"], row["width"])
+
+def compare(current, baseline, stage="total_ms"):
+    """Print per-case ratios of a stage against a baseline report."""
+    previous = {case_key(row): row for row in baseline["results"]}
+    ratios = []
+    print(f"\n{stage}: {baseline.get('commit')} -> {current.get('commit')}")
+    for row in current["results"]:
+        old = previous.get(case_key(row))
+        if not old or not old[stage]:
+            continue
+        ratio = row[stage] / old[stage]
+        ratios.append(ratio)
+        flag = "  <-- slower" if ratio > 1.1 else ""
+        print(f"{' '.join(str(part) for part in case_key(row)):<32} {old[stage]:9.3f} -> {row[stage]:9.3f} ms  x{ratio:.2f}{flag}")
+    if ratios:
+        print(f"Geometric mean ratio: x{statistics.geometric_mean(ratios):.3f} over {len(ratios)} cases")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ASCII art pipeline")
+    parser.add_argument("--output", default="ascii_benchmark.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per case (the median is reported)")
+    parser.add_argument("--quick", action="store_true", help="Small subset for a fast smoke run")
+    args = parser.parse_args()
+
+    if args.quick:
+        report = run_benchmark(RESOLUTIONS[:2], ["RGB", "L"], ["PNG"], [20, 100, 1000], max(1, args.repeats // 2))
+    else:
+        report = run_benchmark(RESOLUTIONS, MODES, FORMATS, WIDTHS, args.repeats)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results for {len(report['results'])} cases saved to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
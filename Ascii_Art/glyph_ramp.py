@@ -0,0 +1,132 @@
+"""
+Glyph density ramps measured from a real monospace font.
+
+Rasterizing every printable character and measuring its ink coverage is
+done once per font and cached on disk as JSON. Conversions then only use
+the precomputed 256-entry lookup tables built from the cached ramp.
+"""
+import os
+import json
+import string
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Monospace fonts tried in order before falling back to Pillow's default font
+FONT_CANDIDATES = [
+    "DejaVuSansMono.ttf",
+    "LiberationMono-Regular.ttf",
+    "SourceCodePro-Regular.ttf",
+    "Menlo.ttc",
+    "consola.ttf",
+    "cour.ttf"
+]
+
+CACHE_DIR = os.environ.get(
+    "ASCII_ART_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "python-mini-projects", "glyphs")
+)
+
+PRINTABLE = "".join(c for c in string.printable if c.isprintable())
+
+# Characters drawn along edges, by edge direction: horizontal, rising, vertical, falling
+EDGE_GLYPHS = "-/|\\"
+
+# Resolution of the gradient lookup table, per axis
+GRADIENT_BINS = 32
+
+def load_font(font_path=None, size=24):
+    """Load the requested font, the first available monospace candidate, or the default font."""
+    for candidate in ([font_path] if font_path else FONT_CANDIDATES):
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+def font_name(font):
+    path = getattr(font, "path", None)
+    name = os.path.splitext(os.path.basename(path))[0] if path else "default"
+    return f"{name}-{getattr(font, 'size', 0)}"
+
+def measure_coverage(font, chars=PRINTABLE):
+    """Render each character in a fixed-size cell and return its ink coverage (0-1)."""
+    boxes = [font.getbbox(c) for c in chars]
+    cell_width = max(max(box[2] for box in boxes), 1)
+    cell_height = max(max(box[3] for box in boxes), 1)
+
+    coverage = {}
+    for c in chars:
+        cell = Image.new("L", (cell_width, cell_height), 0)
+        ImageDraw.Draw(cell).text((0, 0), c, font=font, fill=255)
+        coverage[c] = float(np.asarray(cell).mean() / 255)
+    return coverage
+
+def build_ramp(coverage, size=16):
+    """
+    Pick `size` characters whose coverage is spread evenly from densest to
+    lightest, matching the darkest-to-lightest order of ASCII_CHARS.
+    """
+    ordered = sorted(coverage.items(), key=lambda item: item[1], reverse=True)
+    densest, lightest = ordered[0][1], ordered[-1][1]
+    ramp = []
+    for target in np.linspace(densest, lightest, size):
+        char, value = min(ordered, key=lambda item: abs(item[1] - target))
+        if char not in (c for c, _ in ramp):
+            ramp.append((char, value))
+    return ramp
+
+def load_ramp(size=16, font_path=None):
+    """Return the cached ramp for a font, measuring and caching it on first use."""
+    font = load_font(font_path)
+    cache_path = os.path.join(CACHE_DIR, f"{font_name(font)}-{size}.json")
+    try:
+        with open(cache_path) as f:
+            return [tuple(entry) for entry in json.load(f)["ramp"]]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    ramp = build_ramp(measure_coverage(font), size)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump({"font": font_name(font), "ramp": ramp}, f)
+    except OSError:
+        pass
+    return ramp
+
+def ramp_lut(ramp):
+    """256-entry lookup table from grayscale level to the byte of the closest-density glyph."""
+    chars = np.frombuffer("".join(c for c, _ in ramp).encode("ascii"), dtype=np.uint8)
+    coverage = np.array([value for _, value in ramp])
+    # Level 0 wants the densest glyph and level 255 the lightest
+    targets = coverage.max() - np.arange(256) / 255 * (coverage.max() - coverage.min())
+    return chars[np.abs(targets[:, None] - coverage[None, :]).argmin(axis=1)]
+
+def gradient_lut(threshold=48):
+    """
+    Lookup table from quantized (gx, gy) gradient bins to an edge glyph byte,
+    or 0 where the gradient is too weak to count as an edge.
+    """
+    centers = (np.arange(GRADIENT_BINS) + 0.5) / GRADIENT_BINS * 510 - 255
+    gx, gy = np.meshgrid(centers, centers, indexing="ij")
+    # Edges run perpendicular to the gradient; image rows grow downwards
+    angle = (np.degrees(np.arctan2(-gy, gx)) + 90) % 180
+    direction = ((angle + 22.5) // 45).astype(int) % 4
+    glyphs = np.frombuffer(EDGE_GLYPHS.encode("ascii"), dtype=np.uint8)
+    return np.where(np.hypot(gx, gy) >= threshold, glyphs[direction], 0).astype(np.uint8)
+
+def apply_edges(pixels, chars, edge_lut):
+    """Replace characters on strong edges with a directional glyph, in place."""
+    pixels = pixels.astype(np.int16)
+    gx = np.zeros_like(pixels)
+    gy = np.zeros_like(pixels)
+    gx[:, 1:-1] = pixels[:, 2:] - pixels[:, :-2]
+    gy[1:-1, :] = pixels[2:, :] - pixels[:-2, :]
+    bins_x = (gx + 255) * GRADIENT_BINS // 511
+    bins_y = (gy + 255) * GRADIENT_BINS // 511
+    edges = edge_lut[bins_x, bins_y]
+    np.copyto(chars, edges, where=edges != 0)
+    return chars
@@ -2,9 +2,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
 
+try:
+    from result_cache import cached
+except ImportError:  # Running outside the hub, without the shared cache
+    def cached(name=None, ttl=None, max_memory_mb=None, max_disk_mb=None, cache_if=None):
+        return lambda func: func
+
+@cached()
 def generate_sample_sensor_data(n_samples=1000):
     """Generate sample sensor data for demonstration"""
     np.random.seed(42)
@@ -32,8 +37,13 @@ def generate_sample_sensor_data(n_samples=1000):
     
     return data
 
+@cached()
 def detect_anomalies(data, contamination=0.05):
     """Detect anomalies in sensor data using Isolation Forest"""
+    # scikit-learn is slow to import, so defer it until detection is requested
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+
     # Prepare data for anomaly detection
     features = ['temperature', 'voltage', 'current']
     X = data[features]
@@ -1,8 +1,6 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import sys
 from pathlib import Path
@@ -12,7 +10,8 @@ current_dir = Path(__file__).parent
 if str(current_dir) not in sys.path:
     sys.path.append(str(current_dir))
 
-import anomaly_detection
+# plotly and the anomaly detection module (scikit-learn) are imported lazily
+# by the pages that need them, so loading this module stays cheap
 
 # Constants for calculations
 BATTERY_CAPACITY = 500  # Wh
@@ -23,30 +22,46 @@ ASSIST_LEVELS = {
     'TURBO': 1.3
 }
 
-def calculate_range(terrain_type, assist_level, rider_weight, battery_health):
-    """Calculate estimated range based on various factors"""
+TERRAIN_FACTORS = {
+    'Flat': 1.0,
+    'Rolling Hills': 0.8,
+    'Mountainous': 0.6
+}
+
+# Axes of the what-if range surface on the Range Estimation page
+RANGE_WEIGHTS = np.arange(40, 151, 5)  # kg
+RANGE_HEALTHS = np.arange(0, 101, 5)  # %
+
+def range_grid(terrain_types, assist_levels, rider_weights, battery_healths):
+    """
+    Estimated range in km for every combination of the inputs, computed in one NumPy pass.
+    Each argument is a single value or a sequence; the result has one axis per argument,
+    in order: (terrain, assist level, rider weight, battery health). Values are not rounded.
+    """
+    terrain = np.array([TERRAIN_FACTORS[t] for t in np.atleast_1d(terrain_types)])
+    assist = np.array([ASSIST_LEVELS[a.upper()] for a in np.atleast_1d(assist_levels)])
+    weight = np.atleast_1d(np.asarray(rider_weights, dtype=float))
+    health = np.atleast_1d(np.asarray(battery_healths, dtype=float))
+
     # Base range calculation
     base_range = BATTERY_CAPACITY / 15  # Assuming 15Wh/km base consumption
     
-    # Apply terrain factor
-    terrain_factors = {
-        'Flat': 1.0,
-        'Rolling Hills': 0.8,
-        'Mountainous': 0.6
-    }
-    range_with_terrain = base_range * terrain_factors[terrain_type]
-    
-    # Apply assist level factor
-    range_with_assist = range_with_terrain / ASSIST_LEVELS[assist_level.upper()]
+    # Apply terrain and assist level factors
+    range_with_assist = (base_range * terrain)[:, None] / assist[None, :]
     
     # Apply weight factor (assuming base calculation is for 75kg rider)
-    weight_factor = 1 - ((rider_weight - 75) * 0.003)  # 0.3% reduction per kg above 75kg
-    range_with_weight = range_with_assist * weight_factor
+    weight_factor = 1 - ((weight - 75) * 0.003)  # 0.3% reduction per kg above 75kg
+    range_with_weight = range_with_assist[:, :, None] * weight_factor
     
     # Apply battery health factor
-    range_with_battery = range_with_weight * (battery_health / 100)
+    range_with_battery = range_with_weight[..., None] * (health / 100)
     
-    return max(round(range_with_battery, 1), 0)
+    return np.maximum(range_with_battery, 0)
+
+def calculate_range(terrain_type, assist_level, rider_weight, battery_health):
+    """Calculate estimated range based on various factors"""
+    range_km = float(range_grid(terrain_type, assist_level, rider_weight, battery_health)[0, 0, 0, 0])
+    return max(round(range_km, 1), 0)
 
 def predict_battery_lifespan(cycles, depth_of_discharge):
     """Predict remaining battery lifespan based on usage patterns"""
@@ -90,6 +105,8 @@ def validate_ride_data(df):
 
 def show_ride_analytics(df):
     """Display ride analytics for the given dataframe"""
+    import plotly.express as px
+
     # Ride statistics
     col1, col2, col3 = st.columns(3)
     
@@ -171,6 +188,69 @@ def show_ride_analytics(df):
             key='download-csv'
         )
 
+def show_range_tradeoffs(terrain, assist, weight, battery_health):
+    """Heatmaps of the estimated range across every what-if scenario around the current inputs"""
+    import plotly.graph_objects as go
+
+    terrains = list(TERRAIN_FACTORS.keys())
+    assists = list(ASSIST_LEVELS.keys())
+    # Whole scenario grid, including the rider's exact weight and battery health
+    weights = np.union1d(RANGE_WEIGHTS, [weight])
+    healths = np.union1d(RANGE_HEALTHS, [battery_health])
+    ranges = range_grid(terrains, assists, weights, healths)
+    current = (
+        terrains.index(terrain),
+        assists.index(assist),
+        int(np.searchsorted(weights, weight)),
+        int(np.searchsorted(healths, battery_health))
+    )
+
+    st.subheader("Range Trade-offs")
+
+    # Rider weight and battery health for the selected terrain and assist level
+    fig_surface = go.Figure(go.Heatmap(
+        x=healths,
+        y=weights,
+        z=ranges[current[0], current[1]],
+        colorscale="RdYlGn",
+        zmin=0,
+        colorbar={'title': "km"},
+        hovertemplate="Battery health %{x}%<br>Rider weight %{y} kg<br>Range %{z:.1f} km<extra></extra>"
+    ))
+    fig_surface.add_trace(go.Scatter(
+        x=[battery_health],
+        y=[weight],
+        mode="markers",
+        marker={'symbol': "x", 'size': 12, 'color': "black"},
+        name="Your inputs",
+        hoverinfo="skip"
+    ))
+    fig_surface.update_layout(
+        title=f"Range on {terrain} terrain in {assist} mode",
+        xaxis_title="Battery Health (%)",
+        yaxis_title="Rider Weight (kg)",
+        showlegend=False
+    )
+    st.plotly_chart(fig_surface)
+
+    # Terrain and assist level for the selected rider weight and battery health
+    fig_modes = go.Figure(go.Heatmap(
+        x=assists,
+        y=terrains,
+        z=ranges[:, :, current[2], current[3]],
+        colorscale="RdYlGn",
+        zmin=0,
+        colorbar={'title': "km"},
+        texttemplate="%{z:.1f}",
+        hovertemplate="%{y}, %{x}<br>Range %{z:.1f} km<extra></extra>"
+    ))
+    fig_modes.update_layout(
+        title=f"Range at {weight} kg and {battery_health}% battery health",
+        xaxis_title="Assist Level",
+        yaxis_title="Terrain Type"
+    )
+    st.plotly_chart(fig_modes)
+
 def main():
     st.title("Bosch eBike Analytics System")
     
@@ -188,7 +268,7 @@ def main():
         with col1:
             terrain = st.selectbox(
                 "Terrain Type",
-                ["Flat", "Rolling Hills", "Mountainous"]
+                list(TERRAIN_FACTORS.keys())
             )
             
             assist = st.selectbox(
@@ -212,6 +292,8 @@ def main():
             )
         
         if st.button("Calculate Range"):
+            import plotly.graph_objects as go
+
             range_estimate = calculate_range(terrain, assist, weight, battery_health)
             
             # Display result with gauge chart
@@ -241,6 +323,8 @@ def main():
             - Weight factor is calculated relative to a 75kg reference
             - Current battery health: {battery_health}%
             """)
+
+        show_range_tradeoffs(terrain, assist, weight, battery_health)
     
     elif page == "Battery Health":
         st.header("Battery Health Analysis")
@@ -264,6 +348,8 @@ def main():
             ) / 100
         
         remaining_life = predict_battery_lifespan(cycles, avg_discharge)
+
+        import plotly.graph_objects as go
         
         # Display battery health gauge
         fig = go.Figure(go.Indicator(
@@ -368,6 +454,7 @@ def main():
             show_ride_analytics(df)
     
     else:  # Anomaly Detection page
+        import anomaly_detection
         anomaly_detection.main()
 
 if __name__ == "__main__":
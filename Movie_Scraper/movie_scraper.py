@@ -1,12 +1,18 @@
 import streamlit as st
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import time
 import re
 import json
 from datetime import datetime
 
+try:
+    from result_cache import cached
+except ImportError:  # Running outside the hub, without the shared cache
+    def cached(name=None, ttl=None, max_memory_mb=None, max_disk_mb=None, cache_if=None):
+        return lambda func: func
+
+@cached(ttl=3600, cache_if=bool)
 def search_movie(query):
     """Search for movies on IMDB"""
     # Format query for URL
@@ -47,6 +53,7 @@ def search_movie(query):
         st.error(f"Error searching for movies: {str(e)}")
         return []
 
+@cached(ttl=6 * 3600, cache_if=lambda details: details.get('title') != "Error")
 def get_movie_details(movie_id):
     """Get detailed information about a movie"""
     url = f"https://www.imdb.com/title/{movie_id}/"
@@ -5,6 +5,12 @@ import tempfile
 import os
 import time
 
+try:
+    from result_cache import cached
+except ImportError:  # Running outside the hub, without the shared cache
+    def cached(name=None, ttl=None, max_memory_mb=None, max_disk_mb=None, cache_if=None):
+        return lambda func: func
+
 def init_styles():
     """Initialize custom CSS styles"""
     st.markdown("""
@@ -168,6 +174,7 @@ def record_from_mic(duration=5):
         except Exception as e:
             return False, f"An error occurred: {str(e)}"
 
+@cached(cache_if=lambda result: result[0])
 def transcribe_audio(audio_file):
     """Transcribe audio file to text"""
     r = sr.Recognizer()
@@ -0,0 +1,187 @@
+"""
+Bitboard search engine for 3x3 Tic-Tac-Toe.
+
+Each side's stones are held in a 9-bit integer (bit i is square i), so a
+position is a pair of small ints and a win test is eight mask comparisons.
+Every position the engine solves goes into a transposition table that lives
+as long as the process. Later moves and games reuse it, so once the
+reachable positions (a few thousand) have been seen, a move is a handful of
+table lookups.
+
+SolvedTable goes one step further and stores the best move and value of
+every reachable position, up to rotation and reflection, so choosing a move
+is a single dictionary lookup.
+"""
+import functools
+import threading
+
+FULL_BOARD = 0x1FF
+
+WINNING_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # Rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # Columns
+    (0, 4, 8), (2, 4, 6)              # Diagonals
+)
+
+WIN_MASKS = tuple(sum(1 << i for i in line) for line in WINNING_LINES)
+
+def has_won(bits):
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+def symmetries(n):
+    """
+    The eight rotations and reflections of an n x n board, each as a tuple
+    mapping a square to the square it moves to
+    """
+    def square(row, col):
+        return row * n + col
+
+    transforms = [
+        lambda r, c: (r, c),
+        lambda r, c: (c, n - 1 - r),
+        lambda r, c: (n - 1 - r, n - 1 - c),
+        lambda r, c: (n - 1 - c, r),
+        lambda r, c: (r, n - 1 - c),
+        lambda r, c: (n - 1 - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (n - 1 - c, n - 1 - r)
+    ]
+    return [
+        tuple(square(*transform(i // n, i % n)) for i in range(n * n))
+        for transform in transforms
+    ]
+
+SYMMETRIES = symmetries(3)
+
+# For each symmetry, the transformed value of every 9-bit board
+_TRANSFORMED_BITS = [
+    [sum(1 << perm[i] for i in range(9) if bits >> i & 1) for bits in range(FULL_BOARD + 1)]
+    for perm in SYMMETRIES
+]
+
+def canonical(own, other):
+    """(key, symmetry index) of the smallest transformed form of a position"""
+    return min(
+        (table[own] << 9 | table[other], index)
+        for index, table in enumerate(_TRANSFORMED_BITS)
+    )
+
+def empty_squares(own, other):
+    empty = FULL_BOARD & ~(own | other)
+    return [i for i in range(9) if empty >> i & 1]
+
+def unique_moves(own, other):
+    """
+    Empty squares with moves that are mirror images of each other under the
+    position's own symmetries reduced to the lowest-numbered one
+    """
+    stabilizer = [
+        perm for perm, table in zip(SYMMETRIES, _TRANSFORMED_BITS)
+        if table[own] == own and table[other] == other
+    ]
+    return [i for i in empty_squares(own, other) if all(perm[i] >= i for perm in stabilizer)]
+
+class BitboardEngine:
+    """
+    Exact negamax over bitboards. Scores are from the point of view of the
+    side to move: 0 for a draw, otherwise the number of empty squares left
+    when the game ends plus one, positive for a win and negative for a loss,
+    so quicker wins and slower losses are preferred.
+
+    With use_symmetry, rotations and reflections of a position share one
+    table entry and mirror-image moves are only searched once at the root.
+    """
+
+    def __init__(self, use_symmetry=True):
+        self.use_symmetry = use_symmetry
+        self.table = {}  # position key -> exact score
+        self.nodes = 0
+
+    def score(self, own, other):
+        key = canonical(own, other)[0] if self.use_symmetry else own << 9 | other
+        value = self.table.get(key)
+        if value is not None:
+            return value
+
+        self.nodes += 1
+        empty = FULL_BOARD & ~(own | other)
+        if has_won(other):
+            value = -(bin(empty).count("1") + 1)
+        elif not empty:
+            value = 0
+        else:
+            value = max(-self.score(other, own | 1 << i) for i in range(9) if empty >> i & 1)
+        self.table[key] = value
+        return value
+
+    def move_scores(self, own, other):
+        """Score of every legal move for the side to move, one move per symmetry class"""
+        moves = unique_moves(own, other) if self.use_symmetry else empty_squares(own, other)
+        return {i: -self.score(other, own | 1 << i) for i in moves}
+
+    def best_move(self, own, other):
+        """Lowest-numbered square among the best moves, or None on a full board"""
+        scores = self.move_scores(own, other)
+        if not scores:
+            return None
+        return max(scores, key=lambda i: (scores[i], -i))
+
+class SolvedTable:
+    """
+    Best move and game value of every position reachable from the empty
+    board, stored once per symmetry class. Keys are canonical positions
+    from the point of view of the side to move.
+    """
+
+    def __init__(self, engine=None):
+        engine = engine or BitboardEngine()
+        self.entries = {}  # canonical key -> (best move in canonical orientation, score)
+        self._fill(0, 0, engine)
+
+    def _fill(self, own, other, engine):
+        if has_won(other) or not FULL_BOARD & ~(own | other):
+            return
+        key, index = canonical(own, other)
+        if key in self.entries:
+            return
+        canonical_own, canonical_other = key >> 9, key & FULL_BOARD
+        scores = engine.move_scores(canonical_own, canonical_other)
+        move = max(scores, key=lambda i: (scores[i], -i))
+        self.entries[key] = (move, scores[move])
+        for i in empty_squares(own, other):
+            self._fill(other, own | 1 << i, engine)
+
+    def lookup(self, own, other):
+        """(best move, score) for the side to move, or None if the position is unreachable or over"""
+        key, index = canonical(own, other)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        move, score = entry
+        # Map the move back from the canonical orientation
+        return SYMMETRIES[index].index(move), score
+
+    def best_move(self, own, other):
+        entry = self.lookup(own, other)
+        return entry[0] if entry else None
+
+# Shared by every game in the process so the table is only ever filled once
+_engine = BitboardEngine()
+
+def get_engine():
+    return _engine
+
+_solved_table = None
+_solved_table_lock = threading.Lock()
+
+def get_solved_table():
+    """The solved table, built on first use and shared by every session"""
+    global _solved_table
+    # Concurrent first callers (a warm-up and a move) wait for a single build
+    with _solved_table_lock:
+        if _solved_table is None:
+            _solved_table = SolvedTable(get_engine())
+        return _solved_table
@@ -0,0 +1,140 @@
+"""
+AI engines for the Tic-Tac-Toe page.
+
+Every engine picks a move for the side to move of a GameState:
+
+    move = get_ai_engine("Monte Carlo").choose_move(game, "hard", stats)
+
+If stats is a dict, the engine fills it with search statistics.
+"""
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+import mcts
+from engine import get_engine, get_solved_table
+from k_in_a_row import Board, get_search_engine
+
+# Seconds a search may take per move (the 3x3 solved table needs no search)
+AI_TIME_BUDGET = 1.0
+
+# Alpha-beta depth limit per difficulty on boards larger than 3x3 (None: use the whole budget)
+SEARCH_DEPTHS = {"easy": 1, "medium": 2, "hard": None}
+
+# Monte Carlo playouts per move for each difficulty
+MCTS_PLAYOUTS = {"easy": 500, "medium": 5_000, "hard": 50_000}
+
+# Worker processes growing independent Monte Carlo trees
+MCTS_WORKERS = mcts.default_workers()
+
+class Engine(ABC):
+    name = None
+
+    @abstractmethod
+    def choose_move(self, game, difficulty="hard", stats=None):
+        """The square to play for the side to move, or None if the game is over"""
+
+    def prepare(self):
+        """Start anything slow to set up, so the first move does not wait for it"""
+
+class MinimaxEngine(Engine):
+    """
+    Perfect play from the solved table on 3x3, diluted with random moves
+    below hard. Time-budgeted alpha-beta search on larger boards.
+    """
+    name = "Minimax"
+
+    def prepare(self):
+        get_solved_table()
+
+    def choose_move(self, game, difficulty="hard", stats=None):
+        empty_squares = game.empty_squares()
+        if not empty_squares or game.game_over:
+            return None
+
+        if (game.size, game.win_length) != (3, 3):
+            return self._search_move(game, difficulty, stats)
+
+        start = time.perf_counter()
+        move = None
+        if difficulty == "easy":
+            # Random move with 70% chance, smart move with 30% chance
+            if np.random.random() < 0.7:
+                move = int(np.random.choice(empty_squares))
+        elif difficulty == "medium":
+            # Random move with 30% chance, smart move with 70% chance
+            if np.random.random() < 0.3:
+                move = int(np.random.choice(empty_squares))
+        if move is not None:
+            if stats is not None:
+                stats.update(move=move, source="random", nodes=0, elapsed=time.perf_counter() - start)
+            return move
+
+        # For hard difficulty or when not making a random move
+        if game.to_move == "X":
+            own, other = game.x_bits, game.o_bits
+        else:
+            own, other = game.o_bits, game.x_bits
+        engine = get_engine()
+        table = get_solved_table()
+        searched = engine.nodes
+        entry = table.lookup(own, other)
+        if entry is not None:
+            move, score = entry
+            source = "table"
+        else:
+            # Not reachable in a normal game, so search it directly
+            move = engine.best_move(own, other)
+            score = engine.move_scores(own, other)[move]
+            source = "search"
+        if stats is not None:
+            # Nodes are positions searched for this move (the one-time table build is not
+            # counted) plus the one position looked up
+            stats.update(
+                move=move,
+                source=source,
+                score=score,
+                nodes=engine.nodes - searched + (1 if source == "table" else 0),
+                elapsed=time.perf_counter() - start
+            )
+        return move
+
+    def _search_move(self, game, difficulty, stats):
+        position = Board(game.size, game.win_length)
+        for idx in game.moves:
+            position.play(idx)
+        result = get_search_engine(game.size, game.win_length).search(
+            position, time_budget=AI_TIME_BUDGET, max_depth=SEARCH_DEPTHS.get(difficulty)
+        )
+        if stats is not None:
+            stats.update(result)
+        return result["move"]
+
+class MCTSEngine(Engine):
+    """Monte Carlo Tree Search; difficulty sets the playout budget, capped by the time budget"""
+    name = "Monte Carlo"
+
+    def prepare(self):
+        if MCTS_WORKERS > 1:
+            mcts.get_pool(MCTS_WORKERS)
+
+    def choose_move(self, game, difficulty="hard", stats=None):
+        if game.game_over:
+            return None
+        result = mcts.best_move(
+            game.size, game.win_length, game.moves,
+            playouts=MCTS_PLAYOUTS[difficulty],
+            workers=MCTS_WORKERS,
+            time_budget=AI_TIME_BUDGET,
+            # Drawn from NumPy's global generator so seeded games replay exactly
+            seed=int(np.random.randint(2**31))
+        )
+        if stats is not None:
+            stats.update(result)
+        return result["move"]
+
+ENGINES = {engine.name: engine for engine in (MinimaxEngine(), MCTSEngine())}
+
+def get_ai_engine(name="Minimax"):
+    return ENGINES[name]
@@ -0,0 +1,110 @@
+"""
+Compact state of one Tic-Tac-Toe game.
+
+The board is two integers with bit i set where X or O stands on square i.
+The game also keeps its move list and a redo stack. The side to move comes
+from the move count, and the winner is cached and updated from the lines
+through each new move. Undo, redo and replay only replay moves, so a
+session stores a few integers instead of an array of strings.
+"""
+from k_in_a_row import get_geometry
+
+class GameState:
+    __slots__ = ("size", "win_length", "x_bits", "o_bits", "moves", "redone", "winner", "winning_line")
+
+    def __init__(self, size=3, win_length=3):
+        self.size = size
+        self.win_length = win_length
+        self.x_bits = 0
+        self.o_bits = 0
+        self.moves = []
+        self.redone = []  # Undone moves, most recent last
+        self.winner = None
+        self.winning_line = None
+
+    def copy(self):
+        state = GameState(self.size, self.win_length)
+        state.x_bits, state.o_bits = self.x_bits, self.o_bits
+        state.moves = list(self.moves)
+        state.redone = list(self.redone)
+        state.winner, state.winning_line = self.winner, self.winning_line
+        return state
+
+    @property
+    def to_move(self):
+        return "X" if len(self.moves) % 2 == 0 else "O"
+
+    @property
+    def game_over(self):
+        return self.winner is not None or len(self.moves) == self.size * self.size
+
+    def cell(self, idx):
+        if self.x_bits >> idx & 1:
+            return "X"
+        if self.o_bits >> idx & 1:
+            return "O"
+        return " "
+
+    def empty_squares(self):
+        occupied = self.x_bits | self.o_bits
+        return [i for i in range(self.size * self.size) if not occupied >> i & 1]
+
+    def play(self, idx):
+        """Place the side to move's mark on an empty square of an unfinished game"""
+        if self.game_over or (self.x_bits | self.o_bits) >> idx & 1:
+            raise ValueError(f"illegal move {idx}")
+        self._place(idx)
+        self.redone.clear()
+
+    def _place(self, idx):
+        player = self.to_move
+        if player == "X":
+            self.x_bits |= 1 << idx
+            bits = self.x_bits
+        else:
+            self.o_bits |= 1 << idx
+            bits = self.o_bits
+        self.moves.append(idx)
+
+        geometry = get_geometry(self.size, self.win_length)
+        for index in geometry.lines_through[idx]:
+            mask = geometry.line_masks[index]
+            if bits & mask == mask:
+                self.winner = player
+                self.winning_line = list(geometry.lines[index])
+                break
+
+    def undo(self):
+        """Take back the last move; returns its square, or None at the start"""
+        if not self.moves:
+            return None
+        idx = self.moves.pop()
+        self.x_bits &= ~(1 << idx)
+        self.o_bits &= ~(1 << idx)
+        self.redone.append(idx)
+        # Play stops at a win, so the position before any move had no winner
+        self.winner = self.winning_line = None
+        return idx
+
+    def redo(self):
+        """Replay the last undone move; returns its square, or None if there is none"""
+        if not self.redone:
+            return None
+        idx = self.redone.pop()
+        self._place(idx)
+        return idx
+
+    def replay(self):
+        """Yield the position after each move, starting from the empty board"""
+        state = GameState(self.size, self.win_length)
+        yield state.copy()
+        for idx in self.moves:
+            state._place(idx)
+            yield state.copy()
+
+    def position_at(self, ply):
+        """The position after the first ply moves"""
+        state = GameState(self.size, self.win_length)
+        for idx in self.moves[:ply]:
+            state._place(idx)
+        return state
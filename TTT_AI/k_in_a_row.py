@@ -0,0 +1,346 @@
+"""
+Search engine for N x N boards with K in a row, such as 7x7 with four in a
+row or 15x15 Gomoku.
+
+All winning lines are generated once per board geometry. Each move updates
+only the lines through its square, which keeps the per-line stone counts,
+the winner and the heuristic evaluation current. The engine runs iterative
+deepening alpha-beta search within a time budget, orders moves by a history
+heuristic, and keeps a transposition table for the life of the process.
+Table keys are canonical under rotation and reflection, so mirror-image
+positions share one entry.
+"""
+import time
+import random
+import functools
+
+from engine import symmetries
+
+EMPTY, FIRST, SECOND = 0, 1, 2
+
+WIN_SCORE = 10 ** 9
+
+# Only squares within this distance of a stone are considered as moves
+NEIGHBOURHOOD = 1
+
+def win_lines(n, k):
+    """Every run of k squares along a row, column or diagonal"""
+    lines = []
+    for row in range(n):
+        for col in range(n):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + d_row * (k - 1), col + d_col * (k - 1)
+                if 0 <= end_row < n and 0 <= end_col < n:
+                    lines.append(tuple((row + d_row * i) * n + col + d_col * i for i in range(k)))
+    return lines
+
+class Geometry:
+    """Precomputed lines, neighbourhoods, symmetries and hash keys for one (n, k)"""
+
+    def __init__(self, n, k):
+        self.n = n
+        self.k = k
+        self.size = n * n
+        self.lines = win_lines(n, k)
+        self.line_masks = [sum(1 << square for square in line) for line in self.lines]
+        self.lines_through = [[] for _ in range(self.size)]
+        for index, line in enumerate(self.lines):
+            for square in line:
+                self.lines_through[square].append(index)
+        self.neighbours = [
+            [
+                r * n + c
+                for r in range(max(row - NEIGHBOURHOOD, 0), min(row + NEIGHBOURHOOD + 1, n))
+                for c in range(max(col - NEIGHBOURHOOD, 0), min(col + NEIGHBOURHOOD + 1, n))
+                if (r, c) != (row, col)
+            ]
+            for row, col in (divmod(square, n) for square in range(self.size))
+        ]
+        # Open lines with c of one player's stones are worth 10^c
+        self.weights = [0] + [10 ** c for c in range(1, k)] + [WIN_SCORE]
+        self.symmetries = symmetries(n)
+        self.inverse_symmetries = []
+        for perm in self.symmetries:
+            inverse = [0] * self.size
+            for square, target in enumerate(perm):
+                inverse[target] = square
+            self.inverse_symmetries.append(tuple(inverse))
+        rng = random.Random(n * 1000 + k)
+        keys = [(0, rng.getrandbits(64), rng.getrandbits(64)) for _ in range(self.size)]
+        # Zobrist keys per symmetry: zobrist[s][square] hashes the square that s moves it to
+        self.zobrist = [[keys[perm[square]] for square in range(self.size)] for perm in self.symmetries]
+
+@functools.lru_cache(maxsize=None)
+def get_geometry(n, k):
+    return Geometry(n, k)
+
+class Board:
+    """
+    Mutable position. cells[i] is EMPTY, FIRST or SECOND. Per-line stone
+    counts, the winner, open threats, the evaluation (from FIRST's point of
+    view) and the Zobrist hashes of all eight symmetric images are updated
+    incrementally by play() and undo().
+    """
+
+    def __init__(self, n, k):
+        self.geometry = get_geometry(n, k)
+        self.n = n
+        self.k = k
+        self.cells = [EMPTY] * self.geometry.size
+        self.counts = [[0] * len(self.geometry.lines) for _ in range(3)]
+        self.nearby = [0] * self.geometry.size  # stones within NEIGHBOURHOOD of each square
+        self.moves = []
+        self.winner = EMPTY
+        self.winning_line = None
+        self.evaluation = 0
+        # Lines one stone short of a win, per player (index EMPTY absorbs the rest)
+        self.threats = [0, 0, 0]
+        self.hashes = [0] * 8
+
+    @property
+    def hash(self):
+        return self.hashes[0]
+
+    def canonical(self):
+        """(smallest hash over the eight symmetric images, index of that symmetry)"""
+        key = min(self.hashes)
+        return key, self.hashes.index(key)
+
+    @property
+    def to_move(self):
+        return FIRST if len(self.moves) % 2 == 0 else SECOND
+
+    def is_full(self):
+        return len(self.moves) == self.geometry.size
+
+    def _line_state(self, index):
+        """(evaluation contribution, player one stone short of completing the line or EMPTY)"""
+        first, second = self.counts[FIRST][index], self.counts[SECOND][index]
+        if second == 0:
+            return self.geometry.weights[first], FIRST if first == self.k - 1 else EMPTY
+        if first == 0:
+            return -self.geometry.weights[second], SECOND if second == self.k - 1 else EMPTY
+        return 0, EMPTY
+
+    def _update_lines(self, square, player, delta):
+        own_counts = self.counts[player]
+        threats = self.threats
+        for index in self.geometry.lines_through[square]:
+            value, threat = self._line_state(index)
+            own_counts[index] += delta
+            new_value, new_threat = self._line_state(index)
+            self.evaluation += new_value - value
+            threats[threat] -= 1
+            threats[new_threat] += 1
+            if delta > 0 and own_counts[index] == self.k and not self.winner:
+                self.winner = player
+                self.winning_line = list(self.geometry.lines[index])
+
+    def _update_hashes(self, square, player):
+        hashes = self.hashes
+        for index, keys in enumerate(self.geometry.zobrist):
+            hashes[index] ^= keys[square][player]
+
+    def play(self, square, player=None):
+        player = player or self.to_move
+        geometry = self.geometry
+        self._update_lines(square, player, 1)
+        for neighbour in geometry.neighbours[square]:
+            self.nearby[neighbour] += 1
+        self.cells[square] = player
+        self._update_hashes(square, player)
+        self.moves.append(square)
+
+    def undo(self):
+        square = self.moves.pop()
+        player = self.cells[square]
+        geometry = self.geometry
+        self._update_lines(square, player, -1)
+        for neighbour in geometry.neighbours[square]:
+            self.nearby[neighbour] -= 1
+        self.cells[square] = EMPTY
+        self._update_hashes(square, player)
+        if self.winner == player and self.winning_line and square in self.winning_line:
+            self.winner = EMPTY
+            self.winning_line = None
+
+    def candidates(self):
+        """Empty squares next to a stone, or the centre on an empty board"""
+        if not self.moves:
+            return [self.geometry.size // 2]
+        cells, nearby = self.cells, self.nearby
+        moves = [i for i in range(self.geometry.size) if not cells[i] and nearby[i]]
+        return moves or [i for i in range(self.geometry.size) if not cells[i]]
+
+    def unique_candidates(self):
+        """candidates() with moves that mirror each other under the position's own symmetries reduced to one"""
+        identity = self.hashes[0]
+        stabilizer = [
+            perm for perm, image in zip(self.geometry.symmetries[1:], self.hashes[1:])
+            if image == identity
+        ]
+        return [m for m in self.candidates() if all(perm[m] >= m for perm in stabilizer)]
+
+class _Timeout(Exception):
+    pass
+
+# Transposition table entry bounds
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class SearchEngine:
+    """
+    Iterative deepening negamax with alpha-beta pruning. The transposition
+    table and history scores are kept between searches; per-search state
+    lives in the search call, so one engine can serve several games.
+
+    With use_symmetry, table entries are keyed by the canonical hash (moves
+    are stored in the canonical orientation) and mirror-image moves are only
+    searched once at the root.
+    """
+
+    def __init__(self, n, k, max_table_entries=1_000_000, use_symmetry=True):
+        self.n = n
+        self.k = k
+        self.max_table_entries = max_table_entries
+        self.use_symmetry = use_symmetry
+        self.table = {}  # key -> (depth, score, bound, best move in canonical orientation)
+        self.history = [[0] * (n * n) for _ in range(3)]
+
+    def search(self, board, time_budget=1.0, max_depth=None):
+        """
+        Best move for the side to move. Returns a dict with the move, its
+        score, the deepest completed depth, nodes searched and seconds taken.
+        """
+        start = time.perf_counter()
+        deadline = start + time_budget
+        max_depth = max_depth or board.geometry.size - len(board.moves)
+        state = {"nodes": 0, "deadline": deadline}
+
+        if len(self.table) > self.max_table_entries:
+            self.table.clear()
+
+        result = {"move": None, "score": 0, "depth": 0}
+        for depth in range(1, max_depth + 1):
+            try:
+                move, score = self._root(board, depth, state)
+            except _Timeout:
+                break
+            result = {"move": move, "score": score, "depth": depth}
+            if abs(score) >= WIN_SCORE - board.geometry.size:
+                break  # Forced result found, deeper search cannot change it
+            if time.perf_counter() >= deadline:
+                break
+
+        if result["move"] is None:
+            # Not even depth 1 finished: fall back to the best-ordered move
+            result["move"] = self._ordered(board, board.candidates(), None)[0]
+        result["nodes"] = state["nodes"]
+        result["elapsed"] = time.perf_counter() - start
+        return result
+
+    def _ordered(self, board, moves, first):
+        history = self.history[board.to_move]
+        moves = sorted(moves, key=lambda m: history[m], reverse=True)
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def _probe(self, board):
+        """(table key, symmetry index, table entry or None, suggested move or None)"""
+        key, symmetry = board.canonical() if self.use_symmetry else (board.hash, 0)
+        entry = self.table.get(key)
+        move = None
+        if entry is not None and entry[3] is not None:
+            move = board.geometry.inverse_symmetries[symmetry][entry[3]]
+        return key, symmetry, entry, move
+
+    def _store(self, board, key, symmetry, depth, score, bound, move):
+        if move is not None:
+            move = board.geometry.symmetries[symmetry][move]
+        self.table[key] = (depth, score, bound, move)
+
+    def _root(self, board, depth, state):
+        key, symmetry, _, tt_move = self._probe(board)
+        candidates = board.unique_candidates() if self.use_symmetry else board.candidates()
+        moves = self._ordered(board, candidates, tt_move)
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_move = moves[0]
+        for move in moves:
+            board.play(move)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, 1, state)
+            finally:
+                board.undo()
+            if score > alpha:
+                alpha, best_move = score, move
+        self._store(board, key, symmetry, depth, alpha, EXACT, best_move)
+        return best_move, alpha
+
+    def _evaluate(self, board, ply):
+        """Heuristic score for the side to move"""
+        player = board.to_move
+        if board.threats[player]:
+            return WIN_SCORE - ply - 1  # Completes a line with the next move
+        score = board.evaluation if player == FIRST else -board.evaluation
+        if board.threats[FIRST + SECOND - player] > 1:
+            # Blocking one threat usually leaves another open
+            score -= board.geometry.weights[board.k - 1] * 10
+        return score
+
+    def _negamax(self, board, depth, alpha, beta, ply, state):
+        state["nodes"] += 1
+        if state["nodes"] & 255 == 0 and time.perf_counter() >= state["deadline"]:
+            raise _Timeout()
+
+        if board.winner:
+            # The previous move won
+            return -(WIN_SCORE - ply)
+        if board.is_full():
+            return 0
+        if depth == 0:
+            return self._evaluate(board, ply)
+
+        original_alpha = alpha
+        key, symmetry, entry, tt_move = self._probe(board)
+        if entry is not None:
+            entry_depth, entry_score, bound, _ = entry
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return entry_score
+                if bound == LOWER:
+                    alpha = max(alpha, entry_score)
+                elif bound == UPPER:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    return entry_score
+
+        player = board.to_move
+        best_score, best_move = -WIN_SCORE - 1, None
+        for move in self._ordered(board, board.candidates(), tt_move):
+            board.play(move)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1, state)
+            finally:
+                board.undo()
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.history[player][move] += depth * depth
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self._store(board, key, symmetry, depth, best_score, bound, best_move)
+        return best_score
+
+@functools.lru_cache(maxsize=None)
+def get_search_engine(n, k):
+    """One engine per board geometry, shared by every game in the process"""
+    return SearchEngine(n, k)
@@ -0,0 +1,188 @@
+"""
+Monte Carlo Tree Search for any board size.
+
+Each iteration descends the tree by UCT and expands one move. It then
+scores the new leaf with a batch of random playouts that are simulated
+together in NumPy. Every playout's move order is drawn in one call, and
+the winner of a playout is the player whose line fills up first. Root
+parallelization grows independent trees in worker processes and adds up
+their root statistics, so strength scales with cores as well as with the
+playout budget.
+"""
+import os
+import math
+import time
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from k_in_a_row import Board, get_geometry, FIRST, SECOND
+
+# Random playouts simulated together for each new leaf
+BATCH_SIZE = 32
+
+# UCT exploration constant
+EXPLORATION = 1.4
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def line_array(n, k):
+    """Winning lines of a board as an (lines, k) index array"""
+    return np.array(get_geometry(n, k).lines, dtype=np.intp)
+
+def simulate(cells, to_move, lines, batch, rng):
+    """
+    Finish a position with `batch` random games at once. Returns the winner
+    of each game: FIRST, SECOND or 0 for a draw.
+    """
+    cells = np.asarray(cells, dtype=np.int8)
+    empty = np.flatnonzero(cells == 0)
+    # rank[b, i]: when empty square i is filled in game b
+    rank = rng.random((batch, empty.size)).argsort(axis=1).argsort(axis=1)
+
+    owners = np.broadcast_to(cells, (batch, cells.size)).copy()
+    owners[:, empty] = np.where(rank % 2 == 0, to_move, FIRST + SECOND - to_move)
+    times = np.full((batch, cells.size), -1, dtype=np.int32)
+    times[:, empty] = rank
+
+    line_owners = owners[:, lines]
+    first_owner = line_owners[..., 0]
+    complete = (first_owner != 0) & (line_owners == first_owner[..., None]).all(axis=2)
+    finished_at = np.where(complete, times[:, lines].max(axis=2), np.iinfo(np.int32).max)
+    first_line = finished_at.argmin(axis=1)
+    games = np.arange(batch)
+    return np.where(complete[games, first_line], first_owner[games, first_line], 0)
+
+class Node:
+    __slots__ = ("move", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, parent, untried):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0  # For the player who made `move`; draws count half
+
+    def select(self):
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda c: c.wins / c.visits + EXPLORATION * math.sqrt(log_visits / c.visits)
+        )
+
+def search(n, k, moves, playouts, time_budget=None, seed=None):
+    """
+    Grow one tree from the position after `moves`. Returns the root's
+    {move: (visits, wins)} and a dict of tree statistics.
+    """
+    rng = np.random.default_rng(seed)
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    lines = line_array(n, k)
+    board = Board(n, k)
+    for move in moves:
+        board.play(move)
+
+    root = Node(None, None, board.candidates())
+    tree_nodes, max_depth, done = 1, 0, 0
+    while done < playouts and (deadline is None or time.perf_counter() < deadline):
+        node, depth = root, 0
+        # Selection
+        while not node.untried and node.children:
+            node = node.select()
+            board.play(node.move)
+            depth += 1
+        # Expansion
+        if node.untried:
+            move = node.untried.pop(int(rng.integers(len(node.untried))))
+            board.play(move)
+            terminal = board.winner or board.is_full()
+            child = Node(move, node, [] if terminal else board.candidates())
+            node.children.append(child)
+            node = child
+            depth += 1
+            tree_nodes += 1
+        max_depth = max(max_depth, depth)
+        # Simulation
+        if board.winner or board.is_full():
+            winners = np.full(BATCH_SIZE, board.winner)
+        else:
+            winners = simulate(board.cells, board.to_move, lines, BATCH_SIZE, rng)
+        wins = {FIRST: int((winners == FIRST).sum()), SECOND: int((winners == SECOND).sum())}
+        draws = BATCH_SIZE - wins[FIRST] - wins[SECOND]
+        # Backpropagation
+        while node is not root:
+            node.visits += BATCH_SIZE
+            node.wins += wins[board.cells[node.move]] + 0.5 * draws
+            board.undo()
+            node = node.parent
+        root.visits += BATCH_SIZE
+        done += BATCH_SIZE
+
+    children = {child.move: (child.visits, child.wins) for child in root.children}
+    return children, {"playouts": done, "nodes": tree_nodes, "depth": max_depth}
+
+def _warm_up():
+    # Busy long enough that each warm-up task lands on a different new worker
+    time.sleep(0.1)
+
+def get_pool(workers):
+    """
+    Worker processes shared by every search; spawned so they never inherit
+    server threads. A new pool is started and waited for here, so spawning
+    does not eat into the first search's time budget.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+            for future in [_pool.submit(_warm_up) for _ in range(workers)]:
+                future.result()
+        return _pool
+
+def best_move(n, k, moves, playouts, workers=1, time_budget=None, seed=None):
+    """
+    Most visited root move after `playouts` playouts, split across `workers`
+    independent trees. Returns a dict with the move and search statistics.
+    """
+    pool = get_pool(workers) if workers > 1 else None
+    start = time.perf_counter()
+    seeds = np.random.SeedSequence(seed).generate_state(workers)
+    share = max(playouts // workers, BATCH_SIZE)
+    if pool is not None:
+        futures = [
+            pool.submit(search, n, k, list(moves), share, time_budget, int(worker_seed))
+            for worker_seed in seeds
+        ]
+        results = [future.result() for future in futures]
+    else:
+        results = [search(n, k, moves, share, time_budget, int(seeds[0]))]
+
+    visits, wins = {}, {}
+    for children, _ in results:
+        for move, (child_visits, child_wins) in children.items():
+            visits[move] = visits.get(move, 0) + child_visits
+            wins[move] = wins.get(move, 0.0) + child_wins
+
+    move = max(visits, key=visits.get) if visits else None
+    return {
+        "move": move,
+        "win_rate": round(wins[move] / visits[move], 3) if move is not None else None,
+        "playouts": sum(info["playouts"] for _, info in results),
+        "nodes": sum(info["nodes"] for _, info in results),
+        "depth": max(info["depth"] for _, info in results),
+        "workers": workers,
+        "elapsed": time.perf_counter() - start
+    }
+
+def default_workers():
+    return max(1, min(4, os.cpu_count() or 1))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Headless self-play tournament for the Tic-Tac-Toe AI.
+
+Plays many games for every pairing of difficulties across a process pool
+and reports strength (win/draw rates) and speed (nodes searched per move,
+moves per second, move latency percentiles). Results are written as JSON so
+engine changes can be compared between commits:
+
+    python selfplay.py --games 1000 --output before.json
+    python selfplay.py --board "7 × 7, four in a row" --games 20 --time-budget 0.2
+    python selfplay.py --engine "Monte Carlo" --games 50
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import itertools
+import subprocess
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import engines
+import tic_tac_toe
+from engine import get_solved_table
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+def _init_worker(time_budget):
+    if time_budget is not None:
+        engines.AI_TIME_BUDGET = time_budget
+    # The tournament already uses every core, so Monte Carlo grows one tree per game
+    engines.MCTS_WORKERS = 1
+    # Build the 3x3 solved table before any move is timed
+    get_solved_table()
+
+def play_game(task):
+    """Play one game; returns the winner plus per-move latencies and node counts"""
+    variant, engine, x_level, o_level, seed = task
+    np.random.seed(seed)
+    game = tic_tac_toe.new_game(variant)
+    levels = {"X": x_level, "O": o_level}
+    latencies, nodes = [], []
+    while not game.game_over:
+        stats = {}
+        start = time.perf_counter()
+        move = tic_tac_toe.get_ai_move(game, levels[game.to_move], stats, engine)
+        latencies.append(time.perf_counter() - start)
+        nodes.append(stats.get("nodes", 0))
+        game.play(move)
+    return {
+        "x": x_level,
+        "o": o_level,
+        "winner": game.winner,
+        "latencies": latencies,
+        "nodes": nodes
+    }
+
+def summarize(games):
+    latencies = np.array([s for game in games for s in game["latencies"]])
+    nodes = [n for game in games for n in game["nodes"]]
+    count = len(games)
+    return {
+        "games": count,
+        "x_win_rate": round(sum(g["winner"] == "X" for g in games) / count, 3),
+        "o_win_rate": round(sum(g["winner"] == "O" for g in games) / count, 3),
+        "draw_rate": round(sum(g["winner"] is None for g in games) / count, 3),
+        "moves": len(latencies),
+        "nodes_per_move": round(sum(nodes) / len(nodes), 1),
+        "moves_per_second": round(len(latencies) / latencies.sum(), 1) if latencies.sum() else None,
+        "latency_p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "latency_p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 3),
+        "latency_p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 3)
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_tournament(variant, games, workers=None, time_budget=None, seed=0, engine="Minimax"):
+    pairings = list(itertools.product(DIFFICULTIES, repeat=2))
+    tasks = [
+        (variant, engine, x_level, o_level, seed + index * games + game)
+        for index, (x_level, o_level) in enumerate(pairings)
+        for game in range(games)
+    ]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(time_budget,)) as executor:
+        results = list(executor.map(play_game, tasks, chunksize=max(1, len(tasks) // (8 * (workers or os.cpu_count() or 1)))))
+    wall_time = time.perf_counter() - start
+
+    by_pairing = {}
+    for result in results:
+        by_pairing.setdefault((result["x"], result["o"]), []).append(result)
+
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "board": variant,
+        "engine": engine,
+        "games_per_pairing": games,
+        "time_budget": time_budget if time_budget is not None else engines.AI_TIME_BUDGET,
+        "wall_seconds": round(wall_time, 2),
+        "overall": summarize(results),
+        "pairings": [
+            {"x": x_level, "o": o_level, **summarize(by_pairing[(x_level, o_level)])}
+            for x_level, o_level in pairings
+        ]
+    }
+
+def print_report(report):
+    print(f"{report['board']}, {report['engine']}: {report['games_per_pairing']} games per pairing in {report['wall_seconds']} s")
+    header = f"{'X':<7}{'O':<7}{'X win':>7}{'O win':>7}{'draw':>7}{'nodes/mv':>10}{'mv/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in report["pairings"] + [{"x": "all", "o": "", **report["overall"]}]:
+        print(
+            f"{row['x']:<7}{row['o']:<7}{row['x_win_rate']:>7.1%}{row['o_win_rate']:>7.1%}{row['draw_rate']:>7.1%}"
+            f"{row['nodes_per_move']:>10,.1f}{row['moves_per_second'] or 0:>10,.0f}"
+            f"{row['latency_p50_ms']:>9.2f}{row['latency_p95_ms']:>9.2f}{row['latency_p99_ms']:>9.2f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Self-play tournament for the Tic-Tac-Toe AI")
+    parser.add_argument("--board", default="3 × 3", choices=list(tic_tac_toe.BOARD_VARIANTS), help="Board variant")
+    parser.add_argument("--engine", default="Minimax", choices=list(engines.ENGINES), help="AI engine playing both sides")
+    parser.add_argument("--games", type=int, default=200, help="Games per difficulty pairing")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--time-budget", type=float, help="Seconds per search move (Minimax on boards larger than 3x3, Monte Carlo on every board)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random moves of easy and medium and the Monte Carlo playouts")
+    parser.add_argument("--output", help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    report = run_tournament(args.board, args.games, args.workers, args.time_budget, args.seed, args.engine)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,32 @@
 import streamlit as st
-import numpy as np
 import time
+import sys
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the current directory to Python path for local imports
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from engines import ENGINES, get_ai_engine
+from game_state import GameState
+
+# Board variants: (board width, stones in a row needed to win)
+BOARD_VARIANTS = {
+    "3 × 3": (3, 3),
+    "7 × 7, four in a row": (7, 4),
+    "15 × 15 Gomoku, five in a row": (15, 5)
+}
+
+# Threads computing AI moves, shared by every session
+AI_WORKERS = 4
+
+# How often the browser polls for a finished AI move, in seconds
+AI_POLL_INTERVAL = 0.25
+
+# Minimum time between moves in AI vs AI games, paced by the polling rather than by sleeping
+AI_VS_AI_MOVE_INTERVAL = 0.8
 
 def init_styles():
     """Initialize custom CSS styles"""
@@ -174,99 +200,33 @@ def init_styles():
         .stMarkdown {
             color: #ffffff;
         }
+        
+        /* AI thinking indicator */
+        .thinking {
+            animation: ttt-pulse 1.2s ease-in-out infinite;
+        }
+        
+        @keyframes ttt-pulse {
+            50% { opacity: 0.4; }
+        }
+        
+        @keyframes ttt-appear {
+            from { opacity: 0; transform: scale(0.6); }
+            to { opacity: 1; transform: scale(1); }
+        }
         </style>
         """, unsafe_allow_html=True)
 
-def create_board():
-    return np.array([" "] * 9)
-
-def check_winner(board, player):
-    # Check rows, columns and diagonals
-    winning_combinations = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
-        [0, 4, 8], [2, 4, 6]  # Diagonals
-    ]
-    
-    for combo in winning_combinations:
-        if all(board[i] == player for i in combo):
-            return True, combo
-    return False, None
-
-def is_board_full(board):
-    return " " not in board
+def new_game(variant="3 × 3"):
+    size, win_length = BOARD_VARIANTS[variant]
+    return GameState(size, win_length)
 
-def get_empty_squares(board):
-    return [i for i, val in enumerate(board) if val == " "]
-
-def minimax(board, depth, is_maximizing, player, alpha=float("-inf"), beta=float("inf")):
+def get_ai_move(game, difficulty="hard", stats=None, engine="Minimax"):
     """
-    Minimax algorithm with alpha-beta pruning.
-    player parameter indicates which AI is currently playing (X or O)
+    Get the AI move for the side to move from the named engine (see engines.ENGINES).
+    If stats is a dict, it receives the engine's search statistics.
     """
-    opponent = "O" if player == "X" else "X"
-    
-    # Check terminal states
-    winner, _ = check_winner(board, player)
-    if winner:
-        return 1
-    winner, _ = check_winner(board, opponent)
-    if winner:
-        return -1
-    if is_board_full(board):
-        return 0
-    
-    if is_maximizing:
-        best_score = float("-inf")
-        for i in get_empty_squares(board):
-            board[i] = player
-            score = minimax(board, depth + 1, False, player, alpha, beta)
-            board[i] = " "
-            best_score = max(score, best_score)
-            alpha = max(alpha, best_score)
-            if beta <= alpha:
-                break
-        return best_score
-    else:
-        best_score = float("inf")
-        for i in get_empty_squares(board):
-            board[i] = opponent
-            score = minimax(board, depth + 1, True, player, alpha, beta)
-            board[i] = " "
-            best_score = min(score, best_score)
-            beta = min(beta, best_score)
-            if beta <= alpha:
-                break
-        return best_score
-
-def get_ai_move(board, difficulty="hard", current_player="O"):
-    """Get AI move based on difficulty and current player"""
-    empty_squares = get_empty_squares(board)
-    if not empty_squares:
-        return None
-        
-    if difficulty == "easy":
-        # Random move with 70% chance, smart move with 30% chance
-        if np.random.random() < 0.7:
-            return np.random.choice(empty_squares)
-    elif difficulty == "medium":
-        # Random move with 30% chance, smart move with 70% chance
-        if np.random.random() < 0.3:
-            return np.random.choice(empty_squares)
-    
-    # For hard difficulty or when not making a random move
-    best_score = float("-inf")
-    best_move = empty_squares[0]
-    
-    for i in empty_squares:
-        board[i] = current_player
-        score = minimax(board, 0, False, current_player)
-        board[i] = " "
-        if score > best_score:
-            best_score = score
-            best_move = i
-    
-    return best_move
+    return get_ai_engine(engine).choose_move(game, difficulty, stats)
 
 def get_button_style(value, winning_cells=None, idx=None):
     """Get the style for a cell based on its value"""
@@ -283,6 +243,122 @@ def get_button_style(value, winning_cells=None, idx=None):
     
     return color
 
+def board_styles(size):
+    """Shrink the cells so boards larger than 3x3 fit on the page"""
+    if size <= 3:
+        return
+    cell = max(22, 330 // size)
+    st.markdown(f"""
+        <style>
+        .stButton > button {{
+            width: {cell}px;
+            height: {cell}px;
+            font-size: {int(cell * 0.6)}px;
+            border-width: 1px;
+            border-radius: 4px;
+            margin: 1px;
+        }}
+        .st-key-new_game button, .st-key-undo button, .st-key-redo button {{
+            width: auto;
+        }}
+        .board-container {{
+            max-width: {size * (cell + 4)}px;
+        }}
+        div[data-testid="column"] {{
+            padding: 0;
+            min-width: 0;
+        }}
+        </style>
+        """, unsafe_allow_html=True)
+
+def last_move_style(idx):
+    """Fade in the AI's newest mark after a short pause, so the thinking delay happens in the browser"""
+    st.markdown(f"""
+        <style>
+        .st-key-btn_{idx} button {{
+            animation: ttt-appear 0.35s ease-out 0.3s both;
+        }}
+        </style>
+        """, unsafe_allow_html=True)
+
+@st.cache_resource
+def get_ai_executor():
+    """Thread pool computing AI moves off the script threads, shared by every session"""
+    return ThreadPoolExecutor(max_workers=AI_WORKERS, thread_name_prefix="ttt-ai")
+
+def _fragment(run_every):
+    """Auto-refreshing fragment decorator, or a plain function on older Streamlit"""
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is None:
+        return lambda func: func
+    return fragment(run_every=run_every)
+
+def request_ai_move(difficulty, engine):
+    """Start computing the AI move in the background, unless it is already running"""
+    if st.session_state.get("ai_job") is not None:
+        return
+    game = st.session_state.game
+    stats = {}
+    future = get_ai_executor().submit(get_ai_move, game.copy(), difficulty, stats, engine)
+    st.session_state.ai_job = {
+        "future": future,
+        "stats": stats,
+        "game": st.session_state.game_id,
+        "position": (game.x_bits, game.o_bits)
+    }
+
+def cancel_ai_move():
+    job = st.session_state.pop("ai_job", None)
+    if job is not None:
+        job["future"].cancel()
+
+def undo_move():
+    """Take back a move; against the AI, take back its reply too so it is the player's turn again"""
+    cancel_ai_move()
+    game = st.session_state.game
+    game.undo()
+    if st.session_state.game_mode == "AI":
+        while game.moves and game.to_move != "X":
+            game.undo()
+    st.session_state.ai_thinking = False
+    st.session_state.last_ai_move = None
+
+def redo_move():
+    game = st.session_state.game
+    game.redo()
+    if st.session_state.game_mode == "AI":
+        while game.redone and game.to_move != "X" and not game.game_over:
+            game.redo()
+        # The AI's reply was never made, so ask for it again
+        st.session_state.ai_thinking = game.to_move == "O" and not game.game_over
+
+@_fragment(run_every=AI_POLL_INTERVAL)
+def poll_ai_move():
+    """Apply the background AI move once it is ready; the browser drives the polling"""
+    job = st.session_state.get("ai_job")
+    if job is None:
+        return
+
+    ready = job["future"].done()
+    if ready and st.session_state.game_mode == "AI_VS_AI":
+        ready = time.time() - st.session_state.get("last_move_at", 0) >= AI_VS_AI_MOVE_INTERVAL
+    if not ready:
+        if not hasattr(st, "fragment") and not hasattr(st, "experimental_fragment"):
+            st.button("Show AI Move", key="ai_refresh")
+        return
+
+    del st.session_state.ai_job
+    game = st.session_state.game
+    if job["game"] == st.session_state.game_id and job["position"] == (game.x_bits, game.o_bits):
+        ai_move = job["future"].result()
+        if ai_move is not None:
+            game.play(ai_move)
+            st.session_state.last_ai_move = ai_move
+            st.session_state.last_move_at = time.time()
+        st.session_state.ai_stats = job["stats"]
+        st.session_state.ai_thinking = False
+    st.rerun()
+
 def render_game_mode_button(icon, title, description):
     return f"""
         <div class="game-mode-button">
@@ -294,22 +370,22 @@ def render_game_mode_button(icon, title, description):
 
 def main():
     # Initialize session state
-    if 'board' not in st.session_state:
-        st.session_state.board = create_board()
-    if 'game_over' not in st.session_state:
-        st.session_state.game_over = False
-    if 'winner' not in st.session_state:
-        st.session_state.winner = None
-    if 'winning_cells' not in st.session_state:
-        st.session_state.winning_cells = None
+    if 'game' not in st.session_state:
+        st.session_state.game = new_game()
     if 'game_mode' not in st.session_state:
         st.session_state.game_mode = None
-    if 'current_player' not in st.session_state:
-        st.session_state.current_player = "X"
     if 'ai_thinking' not in st.session_state:
         st.session_state.ai_thinking = False
     if 'difficulty' not in st.session_state:
         st.session_state.difficulty = "medium"
+    if 'ai_engine' not in st.session_state:
+        st.session_state.ai_engine = "Minimax"
+    if 'prepared_engines' not in st.session_state:
+        st.session_state.prepared_engines = set()
+    if 'board_variant' not in st.session_state:
+        st.session_state.board_variant = "3 × 3"
+    if 'game_id' not in st.session_state:
+        st.session_state.game_id = 0
     
     # Initialize styles
     init_styles()
@@ -319,6 +395,34 @@ def main():
     
     # Game mode selection
     if st.session_state.game_mode is None:
+        variant = st.selectbox("Board", list(BOARD_VARIANTS), key="board_variant_select")
+        if variant != st.session_state.board_variant:
+            st.session_state.board_variant = variant
+            st.session_state.game = new_game(variant)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.session_state.ai_engine = st.selectbox(
+                "AI engine",
+                list(ENGINES),
+                index=list(ENGINES).index(st.session_state.ai_engine),
+                key="ai_engine_select",
+                help="Minimax searches the game tree; Monte Carlo plays random games and keeps the moves that win most"
+            )
+            # Warm the engine up while the player picks a game mode, once per session
+            if st.session_state.ai_engine not in st.session_state.prepared_engines:
+                st.session_state.prepared_engines.add(st.session_state.ai_engine)
+                get_ai_executor().submit(get_ai_engine(st.session_state.ai_engine).prepare)
+        with col2:
+            st.markdown('<div class="difficulty-selector">', unsafe_allow_html=True)
+            st.session_state.difficulty = st.select_slider(
+                "AI difficulty",
+                options=["easy", "medium", "hard"],
+                value=st.session_state.difficulty,
+                key="difficulty_slider"
+            )
+            st.markdown('</div>', unsafe_allow_html=True)
+
         st.markdown('<p class="game-info">Choose your game mode:</p>', unsafe_allow_html=True)
         
         col1, col2, col3 = st.columns(3)
@@ -347,133 +451,125 @@ def main():
                 st.session_state.game_mode = "AI_VS_AI"
                 st.rerun()
         
-        if st.session_state.game_mode == "AI":
-            st.markdown('<div class="difficulty-selector">', unsafe_allow_html=True)
-            st.markdown('<p class="game-info">Select AI Difficulty</p>', unsafe_allow_html=True)
-            difficulty = st.select_slider(
-                "",
-                options=["easy", "medium", "hard"],
-                value="medium",
-                key="difficulty_slider"
-            )
-            st.markdown('</div>', unsafe_allow_html=True)
-            st.session_state.difficulty = difficulty
         return
 
+    game = st.session_state.game
+
     # Game controls
-    col1, col2 = st.columns([1, 3])
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 3])
     with col1:
         if st.button("🔄 New Game", use_container_width=True, key="new_game"):
-            st.session_state.board = create_board()
-            st.session_state.game_over = False
-            st.session_state.winner = None
-            st.session_state.winning_cells = None
+            st.session_state.game = new_game(st.session_state.board_variant)
             st.session_state.game_mode = None
-            st.session_state.current_player = "X"
             st.session_state.ai_thinking = False
+            st.session_state.ai_stats = {}
+            st.session_state.last_ai_move = None
+            st.session_state.game_id += 1
+            cancel_ai_move()
             st.rerun()
-    
+
+    # Undo and redo are for games with a human player; AI vs AI games can be replayed at the end
+    can_edit = st.session_state.game_mode != "AI_VS_AI"
     with col2:
+        if st.button("↶ Undo", use_container_width=True, key="undo", disabled=not (can_edit and game.moves)):
+            undo_move()
+            st.rerun()
+    with col3:
+        if st.button("↷ Redo", use_container_width=True, key="redo",
+                     disabled=not (can_edit and game.redone and not st.session_state.ai_thinking)):
+            redo_move()
+            st.rerun()
+    
+    with col4:
         mode_text = {
             "PVP": "👥 Player vs Player",
-            "AI": f"🤖 Player vs AI (Difficulty: {st.session_state.difficulty.title()})",
-            "AI_VS_AI": "🤖 AI vs AI"
+            "AI": f"🤖 Player vs AI ({st.session_state.ai_engine}, Difficulty: {st.session_state.difficulty.title()})",
+            "AI_VS_AI": f"🤖 AI vs AI ({st.session_state.ai_engine})"
         }
         st.markdown(f'<p class="game-info">{mode_text[st.session_state.game_mode]}</p>', unsafe_allow_html=True)
     
     # Game status
-    if not st.session_state.game_over:
+    if not game.game_over:
         if st.session_state.ai_thinking:
-            st.markdown('<p class="game-status" style="background-color: #2c3338; color: #3b9cff; border: 2px solid #1a1d20;">🤖 AI is thinking...</p>', unsafe_allow_html=True)
+            st.markdown('<p class="game-status thinking" style="background-color: #2c3338; color: #3b9cff; border: 2px solid #1a1d20;">🤖 AI is thinking...</p>', unsafe_allow_html=True)
         else:
-            current = "X" if st.session_state.current_player == "X" else "O"
+            current = game.to_move
             color = "#ff4d5f" if current == "X" else "#3b9cff"
             st.markdown(f'<p class="game-status" style="color: {color};">Current player: {current}</p>', unsafe_allow_html=True)
+
+    # Finished games can be stepped through move by move
+    shown = game
+    if game.game_over and game.moves:
+        ply = st.slider("Replay", 0, len(game.moves), len(game.moves), key=f"replay_{st.session_state.game_id}")
+        if ply < len(game.moves):
+            shown = game.position_at(ply)
     
     # Game board
+    size = game.size
+    board_styles(size)
+    if st.session_state.get("last_ai_move") is not None and shown is game:
+        last_move_style(st.session_state.last_ai_move)
     st.markdown('<div class="board-container">', unsafe_allow_html=True)
-    for i in range(0, 9, 3):
+    for i in range(0, size * size, size):
         st.markdown('<div class="board-row">', unsafe_allow_html=True)
-        cols = st.columns(3)
-        for j in range(3):
+        cols = st.columns(size, gap="small")
+        for j in range(size):
             idx = i + j
             with cols[j]:
-                cell_value = st.session_state.board[idx]
+                cell_value = shown.cell(idx)
                 # In AI vs AI mode, all buttons should be disabled
                 if st.session_state.game_mode == "AI_VS_AI":
                     st.button(cell_value if cell_value != " " else "", key=f"btn_{idx}", disabled=True)
                 else:
-                    if cell_value == " " and not st.session_state.game_over:
+                    if cell_value == " " and not game.game_over:
                         if st.button("", key=f"btn_{idx}"):
                             if not st.session_state.ai_thinking:
-                                st.session_state.board[idx] = st.session_state.current_player
-                                winner, winning_combo = check_winner(st.session_state.board, st.session_state.current_player)
-                                
-                                if winner:
-                                    st.session_state.winner = st.session_state.current_player
-                                    st.session_state.winning_cells = winning_combo
-                                    st.session_state.game_over = True
-                                elif is_board_full(st.session_state.board):
-                                    st.session_state.game_over = True
-                                else:
-                                    if st.session_state.game_mode == "PVP":
-                                        st.session_state.current_player = "O" if st.session_state.current_player == "X" else "X"
-                                    elif st.session_state.game_mode == "AI":
-                                        st.session_state.ai_thinking = True
+                                game.play(idx)
+                                if st.session_state.game_mode == "AI" and not game.game_over:
+                                    st.session_state.ai_thinking = True
                                 st.rerun()
                     else:
                         st.button(cell_value, key=f"btn_{idx}", disabled=True)
         st.markdown('</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
     
-    # AI moves
-    if not st.session_state.game_over and st.session_state.ai_thinking:
-        time.sleep(0.5)
-        ai_move = get_ai_move(st.session_state.board, st.session_state.difficulty)
-        if ai_move is not None:
-            st.session_state.board[ai_move] = "O"
-            winner, winning_combo = check_winner(st.session_state.board, "O")
-            if winner:
-                st.session_state.winner = "O"
-                st.session_state.winning_cells = winning_combo
-                st.session_state.game_over = True
-            elif is_board_full(st.session_state.board):
-                st.session_state.game_over = True
-            else:
-                st.session_state.current_player = "X"
-        st.session_state.ai_thinking = False
-        st.rerun()
-    
-    # AI vs AI mode
-    if st.session_state.game_mode == "AI_VS_AI" and not st.session_state.game_over:
-        time.sleep(0.8)  # Slight delay for better visualization
-        current_player = st.session_state.current_player  # "X" or "O"
-        
-        # Get move for current AI player
-        ai_move = get_ai_move(st.session_state.board, "hard", current_player)
-        
-        if ai_move is not None:
-            st.session_state.board[ai_move] = current_player
-            winner, winning_combo = check_winner(st.session_state.board, current_player)
-            if winner:
-                st.session_state.winner = current_player
-                st.session_state.winning_cells = winning_combo
-                st.session_state.game_over = True
-            elif is_board_full(st.session_state.board):
-                st.session_state.game_over = True
-            else:
-                st.session_state.current_player = "O" if current_player == "X" else "X"
-            st.rerun()
+    # AI moves are computed in the background; the page polls until one is ready
+    if not game.game_over:
+        if st.session_state.game_mode == "AI" and st.session_state.ai_thinking:
+            request_ai_move(st.session_state.difficulty, st.session_state.ai_engine)
+        elif st.session_state.game_mode == "AI_VS_AI":
+            request_ai_move("hard", st.session_state.ai_engine)
+        poll_ai_move()
     
+    # Search statistics of the last AI move
+    stats = st.session_state.get("ai_stats")
+    if stats and "playouts" in stats:
+        st.caption(
+            f"Last AI move: {stats['playouts']:,} playouts on {stats['workers']} workers, "
+            f"{stats['nodes']:,} tree nodes, {stats['win_rate']:.0%} expected score "
+            f"in {stats['elapsed'] * 1000:.0f} ms"
+        )
+    elif stats and "source" in stats:
+        method = {"random": "random move", "table": "solved-table lookup", "search": "exact search"}[stats["source"]]
+        st.caption(
+            f"Last AI move: {method}, {stats['nodes']:,} position{'' if stats['nodes'] == 1 else 's'} examined "
+            f"in {stats['elapsed'] * 1000:.1f} ms"
+        )
+    elif stats:
+        st.caption(
+            f"Last AI move: {stats['nodes']:,} positions searched to depth {stats['depth']} "
+            f"in {stats['elapsed'] * 1000:.0f} ms"
+        )
+
     # Game over status
-    if st.session_state.game_over:
-        if st.session_state.winner:
-            color = "#ff4d5f" if st.session_state.winner == "X" else "#3b9cff"
+    if game.game_over:
+        if game.winner:
+            color = "#ff4d5f" if game.winner == "X" else "#3b9cff"
             st.markdown(
                 f'<p class="game-status" style="background-color: #2c3338; color: {color}; '
                 f'border: 2px solid #1a1d20; font-size: 32px; font-weight: bold; '
                 f'text-shadow: 0 0 10px {color}4d;">'
-                f'🎉 Player {st.session_state.winner} wins! 🎉</p>',
+                f'🎉 Player {game.winner} wins! 🎉</p>',
                 unsafe_allow_html=True
             )
         else:
@@ -4,6 +4,12 @@ import tempfile
 import os
 from io import BytesIO
 
+try:
+    from result_cache import cached
+except ImportError:  # Running outside the hub, without the shared cache
+    def cached(name=None, ttl=None, max_memory_mb=None, max_disk_mb=None, cache_if=None):
+        return lambda func: func
+
 def init_styles():
     """Initialize custom CSS styles"""
     st.markdown("""
@@ -96,6 +102,7 @@ def init_styles():
         </style>
     """, unsafe_allow_html=True)
 
+@cached(cache_if=lambda audio: audio is not None)
 def text_to_speech(text, language='en', accent='com'):
     """Convert text to speech and return the audio file"""
     try:
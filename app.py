@@ -1,11 +1,20 @@
 import streamlit as st
 import os
+import re
 import sys
-import importlib.util
-import subprocess
-import json
+import site
+import importlib.metadata
+import time
+import uuid
+import threading
 from pathlib import Path
 
+from hub_metrics import HubMetrics, session_state_size, start_metrics_server
+from module_registry import ModuleRegistry
+from package_installer import PackageInstaller
+from result_cache import cache_stats, clear_all as clear_result_caches
+from startup_profiler import profiling_enabled, profile_projects, report_to_json
+
 # Set page config
 st.set_page_config(
     page_title="Python Mini Projects Hub",
@@ -14,6 +23,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+METRICS_PAGE = "Metrics"
+
 # Dictionary of project descriptions
 PROJECT_DESCRIPTIONS = {
     "BoschEBike": {
@@ -60,71 +71,165 @@ PROJECT_DESCRIPTIONS = {
     }
 }
 
-def install_package(package_name):
-    """Install a Python package using pip"""
-    try:
-        # Use sys.executable to ensure we use the correct Python interpreter
-        subprocess.check_call(
-            [sys.executable, "-m", "pip", "install", "--user", package_name],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        
-        # Verify installation
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "show", package_name],
-            capture_output=True,
-            text=True
+def normalize_package_name(name):
+    """Normalize a distribution name or requirement string (PEP 503)"""
+    name = re.split(r"[\s\[<>=!~;]", name.strip(), maxsplit=1)[0]
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+class PackageInventory:
+    """In-process view of the installed distributions, built from importlib.metadata"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._packages = {}
+        self.refresh()
+
+    def refresh(self):
+        """Rescan sys.path for installed distributions"""
+        importlib.invalidate_caches()
+        # A fresh `pip install --user` may have created the user site directory
+        user_site = site.getusersitepackages()
+        if os.path.isdir(user_site) and user_site not in sys.path:
+            site.addsitedir(user_site)
+
+        packages = {}
+        for dist in importlib.metadata.distributions():
+            name = dist.metadata["Name"]
+            if name:
+                packages.setdefault(normalize_package_name(name), dist.version)
+
+        with self._lock:
+            self._packages = packages
+
+    def version(self, package_name):
+        """Return the installed version of a package, or None if it is missing"""
+        with self._lock:
+            return self._packages.get(normalize_package_name(package_name))
+
+    def is_installed(self, package_name):
+        return self.version(package_name) is not None
+
+    def missing(self, requirements):
+        """Return the requirements that are not installed"""
+        return [req for req in requirements if not self.is_installed(req)]
+
+@st.cache_resource
+def get_package_inventory():
+    """Package inventory shared across reruns and sessions"""
+    return PackageInventory()
+
+def _on_install_success(job):
+    """Make freshly installed packages visible to every session"""
+    get_package_inventory().refresh()
+    # Re-execute project modules against the newly installed packages
+    get_module_registry().clear()
+
+@st.cache_resource
+def get_package_installer():
+    """Background installer shared across reruns and sessions"""
+    return PackageInstaller(normalize=normalize_package_name, on_success=_on_install_success)
+
+def _fragment(run_every):
+    """Auto-refreshing fragment decorator, or a plain function on older Streamlit"""
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is None:
+        return lambda func: func
+    return fragment(run_every=run_every)
+
+@_fragment(run_every=1)
+def show_install_progress(install_key):
+    """Stream the output of a session's install jobs until they finish"""
+    installer = get_package_installer()
+    jobs = [installer.job(job_id) for job_id in st.session_state.get(install_key, [])]
+    jobs = [job for job in jobs if job is not None]
+
+    for job in jobs:
+        st.progress(
+            job.progress(),
+            text=f"pip install {' '.join(job.packages)}: {job.status} ({job.elapsed():.0f}s)"
         )
-        return result.returncode == 0
-    except subprocess.CalledProcessError as e:
-        st.error(f"Error installing {package_name}: {str(e)}")
-        return False
+        st.code(job.output(tail=15) or "Waiting for pip...", language="text")
+
+    if not all(job.done for job in jobs):
+        if not hasattr(st, "fragment") and not hasattr(st, "experimental_fragment"):
+            st.button("Refresh Progress", key=f"{install_key}_refresh")
+        return
+
+    if all(job.succeeded for job in jobs):
+        del st.session_state[install_key]
+        if refresh_environment():
+            st.rerun()
+        else:
+            st.error("Packages installed but environment refresh failed. Please restart the application.")
+    else:
+        st.error("Failed to install some requirements. Please try installing them manually using pip.")
+        if st.button("Dismiss", key=f"{install_key}_dismiss"):
+            del st.session_state[install_key]
+            st.rerun()
 
 def check_requirements(project):
     """Check if all required packages for a project are installed"""
     if "requirements" not in project:
         return []
     
-    missing_packages = []
     try:
-        # Get list of installed packages using pip
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "list", "--format=json"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        installed_packages = {
-            pkg["name"].lower(): pkg["version"] 
-            for pkg in json.loads(result.stdout)
-        }
-        
-        for package in project["requirements"]:
-            package_name = package.lower().split(">=")[0].split("==")[0].strip()
-            if package_name not in installed_packages:
-                missing_packages.append(package)
+        return get_package_inventory().missing(project["requirements"])
     except Exception as e:
         st.error(f"Error checking packages: {str(e)}")
         return project["requirements"]
-    
-    return missing_packages
+
+@st.cache_resource
+def get_module_registry():
+    """Module registry shared across reruns and sessions"""
+    return ModuleRegistry()
 
 def load_project_module(project_dir, main_file):
-    """Dynamically load a project's main module"""
+    """Load a project's main module through the shared module registry"""
     try:
-        module_path = os.path.join(os.getcwd(), project_dir, main_file)
-        spec = importlib.util.spec_from_file_location(project_dir, module_path)
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[project_dir] = module
-            spec.loader.exec_module(module)
-            return module
-        return None
+        return get_module_registry().load(project_dir, main_file)
     except Exception as e:
         st.error(f"Error loading {project_dir}: {str(e)}")
         return None
 
+def add_project_path(project_dir):
+    """Add a project directory to the Python path for its local imports"""
+    project_path = os.path.join(os.getcwd(), project_dir)
+    if project_path not in sys.path:
+        sys.path.append(project_path)
+
+@st.cache_resource
+def get_startup_profile():
+    """Profile a cold load of every project, once per process"""
+    def load(project_dir, main_file):
+        add_project_path(project_dir)
+        get_module_registry().load(project_dir, main_file)
+
+    projects = {
+        project_dir: project for project_dir, project in PROJECT_DESCRIPTIONS.items()
+        if os.path.isdir(project_dir)
+    }
+    return profile_projects(projects, load)
+
+def show_startup_profile(report):
+    """Display the startup profile as sortable tables with a JSON export"""
+    with st.expander("⏱️ Startup Profile", expanded=True):
+        st.markdown(
+            f"Cold load of all projects took **{report['total_ms']:.0f} ms** "
+            f"(Python {report['python']}, profiled at {report['generated_at']})"
+        )
+        view = st.radio("View", ["Per project", "Per import"], horizontal=True, key="startup_profile_view")
+        if view == "Per project":
+            st.dataframe(report["projects"], use_container_width=True)
+        else:
+            st.dataframe(report["imports"], use_container_width=True)
+        st.download_button(
+            "Export Profile (JSON)",
+            report_to_json(report),
+            "startup_profile.json",
+            "application/json",
+            key="startup_profile_download"
+        )
+
 def refresh_environment():
     """Refresh the Python environment after package installation"""
     try:
@@ -136,7 +241,72 @@ def refresh_environment():
         st.error(f"Error refreshing environment: {str(e)}")
         return False
 
+@st.cache_resource
+def get_hub_metrics():
+    """Metrics store shared across reruns and sessions, plus its Prometheus endpoint"""
+    metrics = HubMetrics()
+    start_metrics_server(metrics)
+    return metrics
+
+def run_project(project_dir, module):
+    """Run a project's main() and record its latency, exceptions and session size"""
+    metrics = get_hub_metrics()
+    if "_metrics_session_id" not in st.session_state:
+        st.session_state._metrics_session_id = uuid.uuid4().hex
+
+    failed = False
+    start = time.perf_counter()
+    try:
+        module.main()
+    except Exception as e:
+        failed = True
+        st.error(f"Error running {project_dir}: {str(e)}")
+    finally:
+        # Also runs when main() stops early for st.rerun()
+        metrics.observe_render(project_dir, time.perf_counter() - start, failed)
+        metrics.observe_session(st.session_state._metrics_session_id, session_state_size(st.session_state))
+
+def show_metrics_page():
+    """Display render latency, exception and session metrics"""
+    metrics = get_hub_metrics()
+    st.header("📊 Hub Metrics")
+
+    sessions = metrics.session_summary()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Active Sessions", sessions["active_sessions"])
+    col2.metric("Mean Session State", f"{sessions['mean_bytes'] / 1024:.1f} KB")
+    col3.metric("Largest Session State", f"{sessions['max_bytes'] / 1024:.1f} KB")
+
+    st.subheader("Render Latency by Project")
+    summary = metrics.render_summary()
+    if not summary:
+        st.info("No project pages have been rendered yet.")
+    else:
+        st.dataframe(summary, use_container_width=True)
+        project = st.selectbox(
+            "Latency Histogram",
+            [row["project"] for row in summary],
+            format_func=lambda x: PROJECT_DESCRIPTIONS.get(x, {}).get("title", x)
+        )
+        st.bar_chart(metrics.histogram(project))
+
+    st.subheader("Result Cache")
+    stats = cache_stats()
+    if not stats:
+        st.info("No cached functions have been called yet.")
+    else:
+        st.dataframe(stats, use_container_width=True)
+        if st.button("Clear Result Caches"):
+            clear_result_caches()
+            st.rerun()
+
+    with st.expander("Prometheus Metrics"):
+        st.code(metrics.prometheus(), language="text")
+
 def main():
+    # Profile before any project is loaded so the numbers reflect a cold start
+    startup_profile = get_startup_profile() if profiling_enabled() else None
+
     # Sidebar
     st.sidebar.title("Navigation")
     st.sidebar.markdown("---")
@@ -157,16 +327,16 @@ def main():
         st.session_state.nav_target = "Home"
     
     # Create selection in sidebar
-    if st.session_state.nav_target == "Home":
-        index = 0
+    pages = ["Home"] + project_dirs + [METRICS_PAGE]
+    if st.session_state.nav_target in pages:
+        index = pages.index(st.session_state.nav_target)
     else:
-        # Add 1 to account for "Home" being the first item
-        index = project_dirs.index(st.session_state.nav_target) + 1
+        index = 0
     
     selected_project = st.sidebar.selectbox(
         "Select a Project",
-        ["Home"] + project_dirs,
-        format_func=lambda x: "Home" if x == "Home" else PROJECT_DESCRIPTIONS[x]["title"],
+        pages,
+        format_func=lambda x: PROJECT_DESCRIPTIONS[x]["title"] if x in PROJECT_DESCRIPTIONS else x,
         index=index
     )
     
@@ -174,6 +344,9 @@ def main():
     st.session_state.nav_target = selected_project
     
     if selected_project == "Home":
+        if startup_profile:
+            show_startup_profile(startup_profile)
+
         # Display project cards in a grid
         col1, col2 = st.columns(2)
         
@@ -192,6 +365,9 @@ def main():
                         st.session_state.nav_target = project_dir
                         st.rerun()
     
+    elif selected_project == METRICS_PAGE:
+        show_metrics_page()
+    
     else:
         # Display selected project
         project = PROJECT_DESCRIPTIONS[selected_project]
@@ -201,43 +377,30 @@ def main():
         
         # Check requirements before running
         missing_packages = check_requirements(project)
-        if missing_packages:
-            st.warning(f"Missing required packages: {', '.join(missing_packages)}")
-            if st.button("Install Missing Requirements"):
-                success = True
-                with st.spinner("Installing required packages..."):
-                    for package in missing_packages:
-                        if not install_package(package):
-                            success = False
-                            break
-                    
-                    if success:
-                        # Refresh the environment
-                        if refresh_environment():
-                            st.success("All requirements installed successfully!")
-                            st.experimental_rerun()
-                        else:
-                            st.error("Packages installed but environment refresh failed. Please restart the application.")
-                    else:
-                        st.error("Failed to install some requirements. Please try installing them manually using pip.")
+        install_key = f"{selected_project}_install_jobs"
+        if missing_packages or st.session_state.get(install_key):
+            if missing_packages:
+                st.warning(f"Missing required packages: {', '.join(missing_packages)}")
+            if not st.session_state.get(install_key):
+                if st.button("Install Missing Requirements"):
+                    jobs = get_package_installer().install(missing_packages)
+                    st.session_state[install_key] = [job.id for job in jobs]
+                    st.rerun()
+            if st.session_state.get(install_key):
+                show_install_progress(install_key)
                 return
         
         # Add the project directory to Python path
-        project_path = os.path.join(os.getcwd(), selected_project)
-        if project_path not in sys.path:
-            sys.path.append(project_path)
+        add_project_path(selected_project)
         
         # Try to load and run the project module
         module = load_project_module(selected_project, project['main_file'])
         if module and hasattr(module, 'main'):
-            try:
-                # Initialize session state for the project if needed
-                if not hasattr(st.session_state, f"{selected_project}_initialized"):
-                    setattr(st.session_state, f"{selected_project}_initialized", True)
-                
-                module.main()
-            except Exception as e:
-                st.error(f"Error running {selected_project}: {str(e)}")
+            # Initialize session state for the project if needed
+            if not hasattr(st.session_state, f"{selected_project}_initialized"):
+                setattr(st.session_state, f"{selected_project}_initialized", True)
+            
+            run_project(selected_project, module)
         else:
             st.error(f"Could not load the {selected_project} module. Please make sure all requirements are installed.")
 
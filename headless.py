@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Headless service layer for the Python Mini Projects Hub.
+
+Runs the projects' pure functions without a Streamlit session, either as a
+batch CLI or as a small local HTTP/JSON API:
+
+    python headless.py tasks
+    python headless.py run ascii --input jobs.jsonl --output results.jsonl --workers 8
+    python headless.py serve --port 8765
+
+Each line of a batch input file is one JSON payload for the task. Binary
+inputs and outputs (images, audio) travel as base64 strings. Only the batch
+CLI may name local files instead (the ascii task's path field); the HTTP API
+rejects them so clients cannot read files on the server.
+
+HTTP endpoints:
+    GET  /tasks          list the available tasks
+    POST /run/<task>     run one payload (JSON object) or a batch (JSON array)
+"""
+import os
+import sys
+import io
+import json
+import base64
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from module_registry import ModuleRegistry
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_registry = ModuleRegistry(root=ROOT)
+
+# Payload fields that read files on this machine, accepted from the batch CLI only
+LOCAL_FIELDS = {"path"}
+
+def load_project(project_dir, main_file):
+    """Load a project module once per process, outside of Streamlit"""
+    project_path = os.path.join(ROOT, project_dir)
+    if project_path not in sys.path:
+        sys.path.append(project_path)
+    return _registry.load(project_dir, main_file)
+
+def _decode(data):
+    return io.BytesIO(base64.b64decode(data))
+
+def _encode(buffer):
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+def _ascii(payload):
+    module = load_project("Ascii_Art", "ascii_art.py")
+    source = _decode(payload["image"]) if "image" in payload else payload["path"]
+    ascii_str = module.image_to_ascii(source, width=int(payload.get("width", 100)))
+    if ascii_str is None:
+        raise ValueError("could not convert image")
+    return {"ascii": ascii_str}
+
+def _range(payload):
+    module = load_project("BoschEBike", "ebike_analytics.py")
+    range_km = module.calculate_range(
+        payload["terrain_type"],
+        payload["assist_level"],
+        float(payload["rider_weight"]),
+        float(payload["battery_health"])
+    )
+    return {"range_km": range_km}
+
+def _anomalies(payload):
+    load_project("BoschEBike", "ebike_analytics.py")
+    import pandas as pd
+    import anomaly_detection
+
+    data = pd.DataFrame(payload["records"])
+    result = anomaly_detection.detect_anomalies(data, float(payload.get("contamination", 0.05)))
+    return {
+        "anomalies": int(result["is_anomaly"].sum()),
+        "is_anomaly": result["is_anomaly"].tolist()
+    }
+
+def _movie(payload):
+    module = load_project("Movie_Scraper", "movie_scraper.py")
+    return module.get_movie_details(payload["movie_id"])
+
+def _tts(payload):
+    module = load_project("TextToSpeech", "text_to_speech.py")
+    audio_buffer = module.text_to_speech(
+        payload["text"],
+        language=payload.get("language", "en"),
+        accent=payload.get("accent", "com")
+    )
+    if audio_buffer is None:
+        raise ValueError("could not convert text to speech")
+    return {"audio": _encode(audio_buffer), "mime": "audio/mp3"}
+
+def _stt(payload):
+    module = load_project("SpeechToText", "SpeechToTxt.py")
+    success, text = module.transcribe_audio(_decode(payload["audio"]))
+    if not success:
+        raise ValueError(text)
+    return {"text": text}
+
+# task name -> (handler, description)
+TASKS = {
+    "ascii": (_ascii, "Ascii_Art.image_to_ascii: {image (base64) | path (CLI only), width}"),
+    "range": (_range, "BoschEBike.calculate_range: {terrain_type, assist_level, rider_weight, battery_health}"),
+    "anomalies": (_anomalies, "BoschEBike.detect_anomalies: {records: [{temperature, voltage, current}], contamination}"),
+    "movie": (_movie, "Movie_Scraper.get_movie_details: {movie_id}"),
+    "tts": (_tts, "TextToSpeech.text_to_speech: {text, language, accent}"),
+    "stt": (_stt, "SpeechToText.transcribe_audio: {audio (base64 WAV)}")
+}
+
+def run_task(task, payload, allow_local=False):
+    """
+    Run a single payload and wrap the outcome in a result envelope.
+    Fields in LOCAL_FIELDS are refused unless allow_local is set.
+    """
+    if task not in TASKS:
+        return {"ok": False, "error": f"unknown task: {task}"}
+    if not allow_local and isinstance(payload, dict) and LOCAL_FIELDS & payload.keys():
+        return {"ok": False, "error": "local file paths are only accepted by the batch CLI, send the data base64 encoded"}
+    try:
+        return {"ok": True, "result": TASKS[task][0](payload)}
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {str(e)}"}
+
+def run_batch(task, payloads, executor, allow_local=False):
+    """Run payloads concurrently, returning results in input order"""
+    return list(executor.map(run_task, [task] * len(payloads), payloads, [allow_local] * len(payloads)))
+
+def make_executor(workers, processes=False):
+    if processes:
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="headless")
+
+class APIHandler(BaseHTTPRequestHandler):
+    """JSON API over the task registry"""
+
+    executor = None
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/tasks":
+            self._send(200, {name: description for name, (_, description) in TASKS.items()})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "run" or parts[1] not in TASKS:
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send(400, {"error": f"invalid JSON: {str(e)}"})
+            return
+
+        if isinstance(payload, list):
+            self._send(200, run_batch(parts[1], payload, self.executor))
+        else:
+            self._send(200, self.executor.submit(run_task, parts[1], payload).result())
+
+def serve(host, port, workers, processes=False):
+    with make_executor(workers, processes) as executor:
+        APIHandler.executor = executor
+        server = ThreadingHTTPServer((host, port), APIHandler)
+        print(f"Serving {len(TASKS)} tasks on http://{host}:{port} with {workers} workers")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+def run_file(task, input_path, output_path, workers, processes=False):
+    with open(input_path) as f:
+        payloads = [json.loads(line) for line in f if line.strip()]
+
+    with make_executor(workers, processes) as executor:
+        results = run_batch(task, payloads, executor, allow_local=True)
+
+    out = open(output_path, "w") if output_path else sys.stdout
+    try:
+        for index, result in enumerate(results):
+            out.write(json.dumps({"index": index, **result}) + "\n")
+    finally:
+        if output_path:
+            out.close()
+
+    failed = sum(1 for result in results if not result["ok"])
+    print(f"{len(results) - failed}/{len(results)} {task} payloads succeeded", file=sys.stderr)
+    return failed == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the mini projects without Streamlit")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("tasks", help="List the available tasks")
+
+    run_parser = subparsers.add_parser("run", help="Process a JSON Lines batch")
+    run_parser.add_argument("task", choices=sorted(TASKS))
+    run_parser.add_argument("--input", required=True, help="JSON Lines file with one payload per line")
+    run_parser.add_argument("--output", help="Where to write JSON Lines results (default: stdout)")
+
+    serve_parser = subparsers.add_parser("serve", help="Start the local HTTP/JSON API")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+
+    for sub in (run_parser, serve_parser):
+        sub.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+        sub.add_argument("--processes", action="store_true",
+                         help="Use worker processes instead of threads (for CPU-bound tasks)")
+
+    args = parser.parse_args()
+    if args.command == "tasks":
+        for name, (_, description) in TASKS.items():
+            print(f"{name:10} {description}")
+    elif args.command == "run":
+        sys.exit(0 if run_file(args.task, args.input, args.output, args.workers, args.processes) else 1)
+    else:
+        serve(args.host, args.port, args.workers, args.processes)
+
+if __name__ == "__main__":
+    main()
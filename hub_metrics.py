@@ -0,0 +1,198 @@
+"""
+Request latency and session resource metrics for the Python Mini Projects Hub.
+
+The hub records how long each project's main() takes per rerun, how often it
+raises, and how much data each session keeps in st.session_state. The
+numbers are shown on the hub's Metrics page and exported in the Prometheus
+text format, by default on http://127.0.0.1:9464/metrics (set
+HUB_METRICS_PORT to change the port, or to 0 to disable the endpoint).
+"""
+import os
+import sys
+import time
+import pickle
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PORT_ENV_VAR = "HUB_METRICS_PORT"
+DEFAULT_PORT = 9464
+
+# Upper bounds of the render latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Sessions that have not rerun for this long are dropped from the gauges
+SESSION_TTL = 3600
+
+def estimate_size(value):
+    """Approximate the memory held by a value, in bytes"""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+def session_state_size(session_state):
+    """Approximate size of a session's state, summed per key"""
+    total = 0
+    for key in list(session_state.keys()):
+        try:
+            total += estimate_size(session_state[key])
+        except KeyError:
+            # Widget state can disappear between listing and reading
+            continue
+    return total
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside the matching bucket"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seen + self.counts[i] >= target:
+                return lower + (bound - lower) * (target - seen) / max(self.counts[i], 1)
+            seen += self.counts[i]
+            lower = bound
+        return LATENCY_BUCKETS[-1]
+
+class HubMetrics:
+    """Thread-safe store for render latency, exception and session metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._renders = {}
+        self._sessions = {}  # session id -> (state bytes, last seen)
+
+    def observe_render(self, project, seconds, failed=False):
+        with self._lock:
+            histogram = self._renders.setdefault(project, _Histogram())
+            histogram.observe(seconds)
+            if failed:
+                histogram.errors += 1
+
+    def observe_session(self, session_id, size_bytes):
+        now = time.time()
+        with self._lock:
+            self._sessions[session_id] = (size_bytes, now)
+            for sid, (_, last_seen) in list(self._sessions.items()):
+                if now - last_seen > SESSION_TTL:
+                    del self._sessions[sid]
+
+    def render_summary(self):
+        """One row per project for display"""
+        with self._lock:
+            return [
+                {
+                    "project": project,
+                    "renders": h.count,
+                    "exceptions": h.errors,
+                    "mean_ms": round(h.sum / h.count * 1000, 1) if h.count else 0.0,
+                    "p50_ms": round(h.quantile(0.5) * 1000, 1),
+                    "p95_ms": round(h.quantile(0.95) * 1000, 1),
+                    "p99_ms": round(h.quantile(0.99) * 1000, 1)
+                }
+                for project, h in sorted(self._renders.items())
+            ]
+
+    def histogram(self, project):
+        """Bucket label -> count for one project"""
+        with self._lock:
+            h = self._renders.get(project)
+            counts = list(h.counts) if h else [0] * (len(LATENCY_BUCKETS) + 1)
+        labels = [f"≤{int(b * 1000)} ms" for b in LATENCY_BUCKETS] + [f">{int(LATENCY_BUCKETS[-1] * 1000)} ms"]
+        return dict(zip(labels, counts))
+
+    def session_summary(self):
+        with self._lock:
+            sizes = [size for size, _ in self._sessions.values()]
+        return {
+            "active_sessions": len(sizes),
+            "total_bytes": sum(sizes),
+            "max_bytes": max(sizes, default=0),
+            "mean_bytes": sum(sizes) // len(sizes) if sizes else 0
+        }
+
+    def prometheus(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP hub_render_seconds Time spent in a project's main() per rerun.",
+            "# TYPE hub_render_seconds histogram"
+        ]
+        with self._lock:
+            renders = sorted(self._renders.items())
+            for project, h in renders:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, h.counts):
+                    cumulative += count
+                    lines.append(f'hub_render_seconds_bucket{{project="{project}",le="{bound}"}} {cumulative}')
+                lines.append(f'hub_render_seconds_bucket{{project="{project}",le="+Inf"}} {h.count}')
+                lines.append(f'hub_render_seconds_sum{{project="{project}"}} {h.sum:.6f}')
+                lines.append(f'hub_render_seconds_count{{project="{project}"}} {h.count}')
+
+            lines.append("# HELP hub_render_exceptions_total Exceptions raised by a project's main().")
+            lines.append("# TYPE hub_render_exceptions_total counter")
+            for project, h in renders:
+                lines.append(f'hub_render_exceptions_total{{project="{project}"}} {h.errors}')
+
+        sessions = self.session_summary()
+        lines += [
+            "# HELP hub_active_sessions Sessions seen within the session TTL.",
+            "# TYPE hub_active_sessions gauge",
+            f"hub_active_sessions {sessions['active_sessions']}",
+            "# HELP hub_session_state_bytes Approximate st.session_state size across sessions.",
+            "# TYPE hub_session_state_bytes gauge",
+            f'hub_session_state_bytes{{stat="total"}} {sessions["total_bytes"]}',
+            f'hub_session_state_bytes{{stat="max"}} {sessions["max_bytes"]}',
+            f'hub_session_state_bytes{{stat="mean"}} {sessions["mean_bytes"]}'
+        ]
+        return "\n".join(lines) + "\n"
+
+def start_metrics_server(metrics, port=None, host="127.0.0.1"):
+    """
+    Serve metrics.prometheus() on /metrics from a daemon thread.
+    Returns the server, or None if the endpoint is disabled or the port is taken.
+    """
+    if port is None:
+        port = int(os.environ.get(PORT_ENV_VAR, DEFAULT_PORT))
+    if not port:
+        return None
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        print(f"Metrics endpoint disabled: could not bind {host}:{port} ({e})", file=sys.stderr)
+        return None
+    threading.Thread(target=server.serve_forever, name="hub-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,62 @@
+"""
+Process-wide cache of the hub's project modules.
+
+Each project's main file is executed at most once and re-executed only when
+one of the project's Python sources changes on disk.
+"""
+import os
+import sys
+import threading
+import importlib.util
+
+class ModuleRegistry:
+    """Process-wide registry that executes each project module at most once per source change"""
+
+    def __init__(self, root=None):
+        self.root = root
+        self._lock = threading.Lock()
+        self._modules = {}
+
+    @staticmethod
+    def source_mtime(project_path):
+        """Latest modification time of the Python sources in a project directory"""
+        return max(
+            (entry.stat().st_mtime_ns for entry in os.scandir(project_path)
+             if entry.is_file() and entry.name.endswith(".py")),
+            default=0
+        )
+
+    def load(self, project_dir, main_file):
+        """Return the project's module, re-executing it only if its sources changed"""
+        project_path = os.path.join(self.root or os.getcwd(), project_dir)
+        mtime = self.source_mtime(project_path)
+
+        with self._lock:
+            cached = self._modules.get(project_dir)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+            if cached:
+                # Hot reload: drop the project's helper modules so they are re-imported too
+                for name, module in list(sys.modules.items()):
+                    module_file = getattr(module, "__file__", None) or ""
+                    if module_file.startswith(project_path + os.sep):
+                        del sys.modules[name]
+
+            module_path = os.path.join(project_path, main_file)
+            spec = importlib.util.spec_from_file_location(project_dir, module_path)
+            if not (spec and spec.loader):
+                return None
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[project_dir] = module
+            try:
+                spec.loader.exec_module(module)
+            except Exception:
+                sys.modules.pop(project_dir, None)
+                raise
+            self._modules[project_dir] = (mtime, module)
+            return module
+
+    def clear(self):
+        with self._lock:
+            self._modules.clear()
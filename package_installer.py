@@ -0,0 +1,140 @@
+"""
+Background package installation for the Python Mini Projects Hub.
+
+A project's missing packages are installed with a single pip invocation on
+a worker thread, so the Streamlit script thread never blocks on pip. Jobs
+are shared process-wide: a session asking for a package that another
+session is already installing attaches to that job instead of starting a
+second pip run.
+"""
+import sys
+import time
+import itertools
+import threading
+import subprocess
+
+MAX_FINISHED_JOBS = 20
+
+class InstallJob:
+    """A single `pip install` run and its streamed output"""
+
+    def __init__(self, job_id, packages):
+        self.id = job_id
+        self.packages = list(packages)
+        self.status = "pending"
+        self.returncode = None
+        self.started_at = None
+        self.finished_at = None
+        self._lines = []
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.status in ("succeeded", "failed")
+
+    @property
+    def succeeded(self):
+        return self.status == "succeeded"
+
+    def output(self, tail=None):
+        """Return the captured pip output, optionally only the last lines"""
+        with self._lock:
+            lines = self._lines[-tail:] if tail else list(self._lines)
+        return "".join(lines)
+
+    def progress(self):
+        """Rough completion fraction based on the packages pip has reported"""
+        if self.done:
+            return 1.0
+        output = self.output().lower()
+        seen = sum(1 for pkg in self.packages if pkg.lower() in output)
+        return min(seen / (len(self.packages) + 1), 0.95)
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def _append(self, line):
+        with self._lock:
+            self._lines.append(line)
+
+    def run(self, on_success=None):
+        self.status = "running"
+        self.started_at = time.time()
+        try:
+            # Use sys.executable to ensure we use the correct Python interpreter
+            process = subprocess.Popen(
+                [sys.executable, "-m", "pip", "install", "--user", *self.packages],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1
+            )
+            for line in process.stdout:
+                self._append(line)
+            self.returncode = process.wait()
+        except Exception as e:
+            self._append(f"Error running pip: {str(e)}\n")
+            self.returncode = -1
+
+        # Refresh before reporting success so pollers see the new packages
+        if self.returncode == 0 and on_success:
+            try:
+                on_success(self)
+            except Exception as e:
+                self._append(f"Error refreshing environment: {str(e)}\n")
+        self.finished_at = time.time()
+        self.status = "succeeded" if self.returncode == 0 else "failed"
+
+class PackageInstaller:
+    """Process-wide installer that deduplicates concurrent install requests"""
+
+    def __init__(self, normalize=str.lower, on_success=None):
+        self._normalize = normalize
+        self._on_success = on_success
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._active = {}  # normalized package name -> running InstallJob
+
+    def install(self, packages):
+        """
+        Start installing packages in the background.
+        Returns the jobs covering them, reusing any job already installing
+        one of the requested packages.
+        """
+        with self._lock:
+            jobs = []
+            new_packages = []
+            for package in packages:
+                job = self._active.get(self._normalize(package))
+                if job is None:
+                    new_packages.append(package)
+                elif job not in jobs:
+                    jobs.append(job)
+
+            if new_packages:
+                job = InstallJob(next(self._ids), new_packages)
+                self._jobs[job.id] = job
+                for package in new_packages:
+                    self._active[self._normalize(package)] = job
+                jobs.append(job)
+                threading.Thread(
+                    target=self._run, args=(job,), name=f"pip-install-{job.id}", daemon=True
+                ).start()
+            return jobs
+
+    def job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job):
+        job.run(self._on_success)
+        with self._lock:
+            for package in job.packages:
+                if self._active.get(self._normalize(package)) is job:
+                    del self._active[self._normalize(package)]
+            finished = [j for j in self._jobs.values() if j.done]
+            for old in finished[:-MAX_FINISHED_JOBS]:
+                del self._jobs[old.id]
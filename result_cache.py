@@ -0,0 +1,261 @@
+"""
+Shared result cache for the Python Mini Projects Hub.
+
+Projects opt in by decorating pure functions:
+
+    @cached(ttl=3600)
+    def get_movie_details(movie_id):
+        ...
+
+Results are keyed by a content hash of the function and its arguments, so
+the same image, title or phrase hits the cache no matter which session asks
+for it. Each decorated function gets an LRU cache with a memory budget, an
+optional on-disk tier with its own budget, and an optional TTL. Values are
+stored pickled, so every hit hands out a fresh copy that callers may mutate.
+
+Defaults come from the environment:
+    HUB_CACHE_MEMORY_MB   memory budget per function (default 64)
+    HUB_CACHE_DISK_MB     disk budget per function (default 0, memory only)
+    HUB_CACHE_DIR         disk tier location (default ~/.cache/python-mini-projects)
+"""
+import os
+import time
+import types
+import pickle
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+
+DEFAULT_MEMORY_MB = float(os.environ.get("HUB_CACHE_MEMORY_MB", 64))
+DEFAULT_DISK_MB = float(os.environ.get("HUB_CACHE_DISK_MB", 0))
+CACHE_DIR = os.environ.get(
+    "HUB_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "python-mini-projects")
+)
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def _hash_into(hasher, obj):
+    """Feed a stable representation of obj into hasher"""
+    hasher.update(type(obj).__qualname__.encode())
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        hasher.update(repr(obj).encode())
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        hasher.update(bytes(obj))
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(str(len(obj)).encode())
+        for item in obj:
+            _hash_into(hasher, item)
+    elif isinstance(obj, dict):
+        hasher.update(str(len(obj)).encode())
+        for key in sorted(obj, key=repr):
+            _hash_into(hasher, key)
+            _hash_into(hasher, obj[key])
+    elif hasattr(obj, "getvalue"):
+        # In-memory files such as BytesIO and Streamlit uploads
+        hasher.update(obj.getvalue())
+    elif hasattr(obj, "tobytes"):
+        # NumPy arrays and PIL images
+        for attr in ("shape", "dtype", "size", "mode"):
+            hasher.update(repr(getattr(obj, attr, None)).encode())
+        hasher.update(obj.tobytes())
+    else:
+        hasher.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+def make_key(func_name, args, kwargs):
+    """Content hash of a call"""
+    hasher = hashlib.sha256(func_name.encode())
+    _hash_into(hasher, args)
+    _hash_into(hasher, kwargs)
+    return hasher.hexdigest()
+
+class ResultCache:
+    """LRU cache of pickled results with memory and disk budgets"""
+
+    def __init__(self, name, max_memory_mb=None, max_disk_mb=None, ttl=None):
+        self.name = name
+        self.ttl = ttl
+        self.max_memory = int((DEFAULT_MEMORY_MB if max_memory_mb is None else max_memory_mb) * 1024 * 1024)
+        self.max_disk = int((DEFAULT_DISK_MB if max_disk_mb is None else max_disk_mb) * 1024 * 1024)
+        self.disk_dir = os.path.join(CACHE_DIR, name) if self.max_disk else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (pickled value, expires at)
+        self._memory = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (True, value) on a hit, (False, None) on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                data, expires = entry
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, pickle.loads(data)
+                self._drop(key)
+
+        data = self._disk_get(key, now)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return False, None
+            self.disk_hits += 1
+            self._store(key, data, now)
+        return True, pickle.loads(data)
+
+    def set(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._store(key, data, time.time())
+        self._disk_set(key, data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._memory = 0
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for entry in os.scandir(self.disk_dir):
+                os.remove(entry.path)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "cache": self.name,
+                "entries": len(self._entries),
+                "memory_kb": round(self._memory / 1024, 1),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+    def _store(self, key, data, now):
+        # Caller holds the lock
+        if key in self._entries:
+            self._drop(key)
+        if len(data) > self.max_memory:
+            return
+        expires = now + self.ttl if self.ttl else None
+        self._entries[key] = (data, expires)
+        self._memory += len(data)
+        while self._memory > self.max_memory:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key):
+        data, _ = self._entries.pop(key)
+        self._memory -= len(data)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _disk_get(self, key, now):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if self.ttl and os.path.getmtime(path) + self.ttl <= now:
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                data = f.read()
+            # Record the access for LRU eviction without resetting the TTL clock
+            os.utime(path, (now, os.path.getmtime(path)))
+            return data
+        except OSError:
+            return None
+
+    def _disk_set(self, key, data):
+        if not self.disk_dir or len(data) > self.max_disk:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp_path = self._disk_path(key) + f".{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._disk_path(key))
+            self._disk_evict()
+        except OSError:
+            pass
+
+    def _disk_evict(self):
+        entries = [e for e in os.scandir(self.disk_dir) if e.name.endswith(".pkl")]
+        total = sum(e.stat().st_size for e in entries)
+        for entry in sorted(entries, key=lambda e: e.stat().st_atime):
+            if total <= self.max_disk:
+                break
+            try:
+                total -= entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+
+def code_version(code, digest=None):
+    """
+    Hash of a function's bytecode, names and constants. Nested code objects
+    (comprehensions, lambdas, inner functions) are hashed the same way rather
+    than by their repr, which holds a memory address that changes per process.
+    """
+    digest = digest or hashlib.sha256()
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            code_version(const, digest)
+        else:
+            digest.update(repr(const).encode())
+    return digest.hexdigest()
+
+def cached(name=None, ttl=None, max_memory_mb=None, max_disk_mb=None, cache_if=None):
+    """
+    Decorator caching a pure function's results across calls and sessions.
+    cache_if(result) can veto caching, e.g. for error results.
+    """
+    def decorator(func):
+        cache = get_cache(name or f"{func.__module__}.{func.__qualname__}", ttl, max_memory_mb, max_disk_mb)
+        # Fold the bytecode into the key so a hot-reloaded function never sees stale results
+        version = code_version(func.__code__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(f"{func.__qualname__}:{version}", args, kwargs)
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            if cache_if is None or cache_if(value):
+                cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+def get_cache(name, ttl=None, max_memory_mb=None, max_disk_mb=None):
+    """Return the named cache, creating it on first use"""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = ResultCache(name, max_memory_mb, max_disk_mb, ttl)
+        return cache
+
+def cache_stats():
+    """Stats rows for every cache in this process"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return [cache.stats() for cache in sorted(caches, key=lambda c: c.name)]
+
+def clear_all():
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
@@ -0,0 +1,188 @@
+"""
+Startup profiling for the Python Mini Projects Hub.
+
+Enable it with the HUB_PROFILE_STARTUP environment variable or the
+--profile-startup flag:
+
+    HUB_PROFILE_STARTUP=1 streamlit run app.py
+    streamlit run app.py -- --profile-startup
+
+Every project module is then loaded once at cold start while an import hook
+records the wall time and memory of each module it pulls in. Memory is
+measured with tracemalloc, which slows imports down, so compare timings
+between profiled runs only.
+"""
+import os
+import sys
+import time
+import json
+import platform
+import threading
+import tracemalloc
+from datetime import datetime
+
+ENV_VAR = "HUB_PROFILE_STARTUP"
+OUTPUT_ENV_VAR = "HUB_PROFILE_OUTPUT"
+CLI_FLAG = "--profile-startup"
+
+def profiling_enabled(argv=None):
+    """Check whether startup profiling was requested"""
+    argv = sys.argv[1:] if argv is None else argv
+    return os.environ.get(ENV_VAR, "").lower() in ("1", "true", "yes") or CLI_FLAG in argv
+
+class _ProfiledLoader:
+    """Loader proxy that measures module creation and execution"""
+
+    def __init__(self, loader, profiler, name):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        # Extension modules do most of their work here
+        return self._profiler.measure(self._name, self._loader.create_module, spec)
+
+    def exec_module(self, module):
+        try:
+            self._profiler.measure(self._name, self._loader.exec_module, module)
+        finally:
+            # Hand the real loader back so nothing downstream sees the proxy
+            module.__loader__ = self._loader
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self._loader
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+class ImportProfiler:
+    """Meta path hook recording per-module import time and memory"""
+
+    def __init__(self):
+        self.project = None
+        self.records = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _ProfiledLoader(spec.loader, self, fullname)
+        return spec
+
+    def measure(self, name, func, *args):
+        """Run func, attributing its time and retained memory to module name"""
+        stack = self._local.__dict__.setdefault("stack", [])
+        frame = {"child_s": 0.0, "child_bytes": 0}
+        stack.append(frame)
+        memory_before = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            memory = (tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0) - memory_before
+            stack.pop()
+            if stack:
+                stack[-1]["child_s"] += elapsed
+                stack[-1]["child_bytes"] += memory
+
+            with self._lock:
+                record = self.records.setdefault(name, {
+                    "project": self.project,
+                    "module": name,
+                    "cumulative_ms": 0.0,
+                    "self_ms": 0.0,
+                    "memory_kb": 0.0,
+                    "self_memory_kb": 0.0
+                })
+                record["cumulative_ms"] += elapsed * 1000
+                record["self_ms"] += (elapsed - frame["child_s"]) * 1000
+                record["memory_kb"] += memory / 1024
+                record["self_memory_kb"] += (memory - frame["child_bytes"]) / 1024
+
+def profile_projects(projects, load):
+    """
+    Load every project with the import hook active and build a report.
+    projects maps a project directory to its PROJECT_DESCRIPTIONS entry and
+    load(project_dir, main_file) must import the project module.
+    """
+    profiler = ImportProfiler()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    project_rows = []
+    total_start = time.perf_counter()
+    profiler.install()
+    try:
+        for project_dir, project in projects.items():
+            profiler.project = project_dir
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            status = "ok"
+            try:
+                load(project_dir, project["main_file"])
+            except Exception as e:
+                status = f"error: {e}"
+            wall_ms = (time.perf_counter() - start) * 1000
+            current, peak = tracemalloc.get_traced_memory()
+
+            project_rows.append({
+                "project": project_dir,
+                "wall_ms": round(wall_ms, 2),
+                "memory_kb": round((current - memory_before) / 1024, 1),
+                "peak_kb": round((peak - memory_before) / 1024, 1),
+                "imports": sum(1 for r in profiler.records.values() if r["project"] == project_dir),
+                "status": status
+            })
+    finally:
+        profiler.uninstall()
+        if started_tracing:
+            tracemalloc.stop()
+
+    import_rows = [
+        {key: round(value, 2) if isinstance(value, float) else value for key, value in record.items()}
+        for record in profiler.records.values()
+    ]
+    import_rows.sort(key=lambda r: r["self_ms"], reverse=True)
+    project_rows.sort(key=lambda r: r["wall_ms"], reverse=True)
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "total_ms": round((time.perf_counter() - total_start) * 1000, 2),
+        "projects": project_rows,
+        "imports": import_rows
+    }
+
+    output_path = os.environ.get(OUTPUT_ENV_VAR)
+    if output_path:
+        with open(output_path, "w") as f:
+            f.write(report_to_json(report))
+    return report
+
+def report_to_json(report):
+    return json.dumps(report, indent=2)